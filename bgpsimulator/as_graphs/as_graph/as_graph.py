@@ -26,27 +26,62 @@ class ASGraph:
         # Always add cycles, provider cones, and propagation ranks
         # if it hasn't been done already
         ASGraphUtils.add_extra_setup(graph_data)
+        # Canonical int object for each ASN. Without this, every set of ASNs
+        # holds it's own duplicate int objects for the same ASNs
+        asn_interner: dict[int, int] = dict()
         # populate basic info
         self.as_dict = {
-            int(asn): AS.from_json(info, as_graph=self)
+            asn_interner.setdefault(int(asn), int(asn)): AS.from_json(
+                info, as_graph=self, asn_interner=asn_interner
+            )
             for asn, info in graph_data["ases"].items()
         }
+        # ASes sorted by ASN, so that they're always iterated in the same order
+        self.ases: list[AS] = sorted(self.as_dict.values())
+        # Checked against every AS path by PeerLockLite, so computed once
+        self.tier_1_asns: frozenset[int] = frozenset(
+            [as_obj.asn for as_obj in self.ases if as_obj.tier_1]
+        )
         # Populate ASN groups
         self.asn_groups = {
-            asn_group_key: {int(x) for x in asn_group}
+            asn_group_key: {asn_interner.setdefault(x, x) for x in map(int, asn_group)}
             for asn_group_key, asn_group in graph_data["asn_groups"].items()
         }
         # populate objects
         self._populate_objects()
-        # Add propagation ranks
-        self.propagation_ranks: list[list[AS]] = [
-            [self.as_dict[int(asn)] for asn in rank]
+        # Add propagation ranks. Tuples, since these are iterated constantly
+        # during propagation and must never be modified
+        self.propagation_ranks: tuple[tuple[AS, ...], ...] = tuple(
+            tuple([self.as_dict[int(asn)] for asn in rank])
             for rank in graph_data["propagation_rank_asns"]
-        ]
+        )
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Pickles the fully built graph, to avoid rebuilding it from JSON"""
+
+        return self.__dict__.copy()
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restores the graph references and proxies that the ASes don't pickle"""
+
+        self.__dict__.update(state)
+        for as_obj in self.ases:
+            as_obj.as_graph = self
+        self._populate_objects()
+
+    def close(self) -> None:
+        """Breaks the ASGraph <-> AS reference cycle
+
+        ASes hold a plain reference to the graph (for speed), so without this
+        the graph is only freed once the cyclic garbage collector runs
+        """
+
+        for as_obj in self.ases:
+            as_obj.as_graph = None  # type: ignore
 
     def _populate_objects(self) -> None:
         """Populates the AS objects with the relationships"""
-        for _asn, as_obj in self.as_dict.items():
+        for as_obj in self.ases:
             as_obj.set_relations()
 
     ##################
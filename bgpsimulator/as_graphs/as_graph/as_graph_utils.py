@@ -1,3 +1,5 @@
+import gc
+from array import array
 from typing import Any, Callable
 
 from frozendict import frozendict
@@ -6,6 +8,9 @@ from bgpsimulator.shared import ASNGroups, CycleError
 
 from .base_as import AS
 
+# (ASNs, indptr, indices) for a relationship key, see ASGraphUtils.get_csr
+CSR = tuple[list[int], "array[int]", "array[int]"]
+
 
 class ASGraphUtils:
     """Utility functions for ASGraph"""
@@ -26,9 +31,23 @@ class ASGraphUtils:
             as_graph_json["ases"] = {
                 int(asn): info for asn, info in as_graph_json["ases"].items()
             }
-            ASGraphUtils.check_for_cycles(as_graph_json)
-            ASGraphUtils.add_provider_cone_asns(as_graph_json)
-            ASGraphUtils.assign_as_propagation_rank(as_graph_json)
+            # These passes create millions of small containers, which
+            # otherwise trigger constant (and useless) full garbage collections
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                # Shared by every pass rather than rebuilt for each one
+                provider_csr = ASGraphUtils.get_csr(as_graph_json, "provider_asns")
+                provider_order = ASGraphUtils.check_for_cycles(
+                    as_graph_json, provider_csr
+                )
+                ASGraphUtils.add_provider_cone_asns(
+                    as_graph_json, provider_csr, provider_order
+                )
+                ASGraphUtils.assign_as_propagation_rank(as_graph_json, provider_csr)
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
             ASGraphUtils.assign_as_graph_propagation_ranks(as_graph_json)
             ASGraphUtils.add_asn_groups(as_graph_json, additional_asn_group_filters)
             as_graph_json["extra_setup_complete"] = True
@@ -38,126 +57,178 @@ class ASGraphUtils:
     ###############
 
     @staticmethod
-    def check_for_cycles(as_graph_json: dict[str, Any]) -> None:
-        """Checks for cycles in the AS graph"""
+    def check_for_cycles(
+        as_graph_json: dict[str, Any], provider_csr: CSR | None = None
+    ) -> list[int]:
+        """Checks for cycles in the AS graph
 
-        # Apply cycle detection to each node in the graph
+        Returns the topological order of the provider CSR, so that the provider
+        cone pass doesn't have to run the same DFS again
+        """
+
+        provider_order: list[int] = []
         for key in ("provider_asns", "customer_asns"):
-            visited: set[int] = set()  # To track nodes that have been fully processed
-            rec_stack: set[int] = (
-                set()
-            )  # Tracks current recursion stack (for cycle detection)
-
-            for asn, as_info in as_graph_json["ases"].items():
-                if asn not in visited:
-                    ASGraphUtils._validate_no_cycles_helper(
-                        asn, as_info, as_graph_json, visited, rec_stack, key
-                    )
+            if key == "provider_asns" and provider_csr is not None:
+                asns, indptr, indices = provider_csr
+            else:
+                asns, indptr, indices = ASGraphUtils.get_csr(as_graph_json, key)
+            order = ASGraphUtils.get_topological_order(asns, indptr, indices, key)
+            if key == "provider_asns":
+                provider_order = order
         as_graph_json["cycles_detected"] = False
+        return provider_order
 
     @staticmethod
-    def _validate_no_cycles_helper(
-        asn: int,
-        as_info: dict[str, Any],
-        as_graph_json: dict[str, Any],
-        visited: set[int],
-        rec_stack: set[int],
-        key: str,
-    ) -> None:
-        """Helper function to detect cycles using DFS"""
-
-        if asn not in visited:
-            visited.add(asn)
-            rec_stack.add(asn)
-
-            # Visit all the providers (similar to graph neighbors) recursively
-            for neighbor_asn in as_info.get(key, []):
-                if neighbor_asn not in visited:
-                    ASGraphUtils._validate_no_cycles_helper(
-                        neighbor_asn,
-                        as_graph_json["ases"][neighbor_asn],
-                        as_graph_json,
-                        visited,
-                        rec_stack,
-                        key,
-                    )
-                elif neighbor_asn in rec_stack:
-                    raise CycleError(f"Cycle detected in {key} for AS {asn}")
-
-        rec_stack.remove(asn)
+    def get_csr(as_graph_json: dict[str, Any], key: str) -> CSR:
+        """Returns the graph for a relationship key in CSR (compressed sparse row) form
+
+        ASNs are mapped (in the order of as_graph_json["ases"]) to a dense index
+        [0..N). The neighbors of the AS at index i are
+        indices[indptr[i]:indptr[i + 1]]. This lets traversals use tight index
+        loops rather than dict lookups keyed on ASN
+
+        indptr and indices are unsigned int arrays rather than lists, since a
+        list of ints costs a pointer plus an int object per edge
+        """
+
+        ases = as_graph_json["ases"]
+        # Iterating in dict order (rather than sorted) avoids a random lookup
+        # into as_graph_json["ases"] for every AS
+        asns: list[int] = list(ases)
+        asn_to_index: dict[int, int] = {asn: i for i, asn in enumerate(asns)}
+        indptr: array[int] = array("I", [0])
+        indices: array[int] = array("I")
+        for as_info in ases.values():
+            indices.extend([asn_to_index[x] for x in as_info.get(key, [])])
+            indptr.append(len(indices))
+        return asns, indptr, indices
+
+    @staticmethod
+    def get_topological_order(
+        asns: list[int], indptr: "array[int]", indices: "array[int]", key: str
+    ) -> list[int]:
+        """Iterative DFS over a CSR graph, raises CycleError if a cycle exists
+
+        Returns the dense indexes in DFS post order, so every AS comes after
+        all of the ASes that it points to (i.e. for provider_asns, providers
+        come before their customers)
+
+        Uses an explicit stack rather than recursion, since recursion is slow
+        and can hit the recursion limit on the full CAIDA graph
+        """
+
+        num_ases = len(asns)
+        visited: list[bool] = [False] * num_ases
+        # Tracks the current DFS path (for cycle detection)
+        on_stack: list[bool] = [False] * num_ases
+        post_order: list[int] = []
+
+        for root in range(num_ases):
+            if visited[root]:
+                continue
+            visited[root] = True
+            on_stack[root] = True
+            # (node, position of the next neighbor to visit within indices)
+            stack: list[tuple[int, int]] = [(root, indptr[root])]
+            while stack:
+                node, pos = stack[-1]
+                if pos < indptr[node + 1]:
+                    stack[-1] = (node, pos + 1)
+                    neighbor = indices[pos]
+                    if not visited[neighbor]:
+                        visited[neighbor] = True
+                        on_stack[neighbor] = True
+                        stack.append((neighbor, indptr[neighbor]))
+                    elif on_stack[neighbor]:
+                        raise CycleError(f"Cycle detected in {key} for AS {asns[node]}")
+                else:
+                    stack.pop()
+                    on_stack[node] = False
+                    post_order.append(node)
+        return post_order
 
     #################
     # Provider cone #
     #################
 
     @staticmethod
-    def add_provider_cone_asns(as_graph_json: dict[str, Any]) -> None:
-        """Adds provider cone ASNs to the AS graph"""
+    def add_provider_cone_asns(
+        as_graph_json: dict[str, Any],
+        provider_csr: CSR | None = None,
+        provider_order: list[int] | None = None,
+    ) -> None:
+        """Adds provider cone ASNs to the AS graph
 
-        cone_dict: dict[int, set[int]] = {}
-        for _asn, as_info in as_graph_json["ases"].items():
-            provider_cone: set[int] = ASGraphUtils._get_cone_helper(
-                as_info, cone_dict, as_graph_json, "provider_asns"
-            )
-            as_info["provider_cone_asns"] = list(provider_cone)
+        Since the topological order has providers before customers, every
+        provider's cone is complete before it gets unioned into it's customers'
+        cones. So each cone is built with set unions, with no recursion and no
+        lookups by ASN
 
-    @staticmethod
-    def _get_cone_helper(
-        as_info: dict[str, Any],
-        cone_dict: dict[int, set[int]],
-        as_graph_json: dict[str, Any],
-        rel_key: str,
-    ) -> set[int]:
-        """Recursively determines the cone of an AS"""
-
-        as_asn = as_info["asn"]
-        if as_asn in cone_dict:
-            return cone_dict[as_asn]
-        else:
-            cone_dict[as_asn] = set()
-            for neighbor_asn in as_info.get(rel_key, []):
-                cone_dict[as_asn].add(neighbor_asn)
-                if neighbor_asn not in cone_dict:
-                    ASGraphUtils._get_cone_helper(
-                        as_graph_json["ases"][neighbor_asn],
-                        cone_dict,
-                        as_graph_json,
-                        rel_key,
-                    )
-                cone_dict[as_asn].update(cone_dict[neighbor_asn])
-        return cone_dict[as_asn]
+        provider_order (from check_for_cycles) must be the topological order
+        of provider_csr
+        """
+
+        if provider_csr is None:
+            provider_csr = ASGraphUtils.get_csr(as_graph_json, "provider_asns")
+            provider_order = None
+        asns, indptr, indices = provider_csr
+        if provider_order is None:
+            provider_order = ASGraphUtils.get_topological_order(
+                asns, indptr, indices, "provider_asns"
+            )
+        # Placeholders, every index is overwritten in topological order
+        cones: list[set[int]] = [set()] * len(asns)
+        for i in provider_order:
+            provider_indexes = indices[indptr[i] : indptr[i + 1]]
+            cone = {asns[x] for x in provider_indexes}
+            for provider_index in provider_indexes:
+                cone |= cones[provider_index]
+            cones[i] = cone
+
+        ases = as_graph_json["ases"]
+        for i, asn in enumerate(asns):
+            ases[asn]["provider_cone_asns"] = list(cones[i])
 
     ##########################
     # Propagation rank funcs #
     ##########################
 
     @staticmethod
-    def assign_as_propagation_rank(as_graph_json: dict[str, Any]) -> None:
-        """Adds propagation rank from the leafs to the input clique"""
+    def assign_as_propagation_rank(
+        as_graph_json: dict[str, Any], provider_csr: CSR | None = None
+    ) -> None:
+        """Adds propagation rank from the leafs to the input clique
 
-        for as_info in as_graph_json["ases"].values():
-            # Always set this to None since you can't trust this value
-            as_info["propagation_rank"] = None
-        for as_info in as_graph_json["ases"].values():
-            ASGraphUtils._assign_ranks_helper(as_info, 0, as_graph_json)
+        Kahn style layered BFS over customer -> provider edges. Each layer is
+        the set of ASes whose customers have all been ranked, so an AS's rank
+        is one more than the highest rank of its customers (leafs are 0)
+        """
 
-    @staticmethod
-    def _assign_ranks_helper(
-        as_info: dict[str, Any], rank: int, as_graph_json: dict[str, Any]
-    ) -> None:
-        """Assigns ranks to all ases in customer/provider chain recursively"""
-
-        if (
-            as_info.get("propagation_rank") is None
-            or as_info["propagation_rank"] < rank
-        ):
-            as_info["propagation_rank"] = rank
-            # Only update it's providers if it's rank becomes higher
-            # This avoids a double for loop of writes
-            for provider_asn in as_info.get("provider_asns", []):
-                ASGraphUtils._assign_ranks_helper(
-                    as_graph_json["ases"][provider_asn], rank + 1, as_graph_json
-                )
+        asns, indptr, indices = provider_csr or ASGraphUtils.get_csr(
+            as_graph_json, "provider_asns"
+        )
+        # Number of customers that have yet to be ranked for each AS
+        unranked_customer_counts: list[int] = [0] * len(asns)
+        for provider_index in indices:
+            unranked_customer_counts[provider_index] += 1
+
+        ranks: list[int] = [0] * len(asns)
+        frontier = [i for i, count in enumerate(unranked_customer_counts) if not count]
+        rank = 0
+        while frontier:
+            next_frontier = []
+            for i in frontier:
+                ranks[i] = rank
+                for provider_index in indices[indptr[i] : indptr[i + 1]]:
+                    unranked_customer_counts[provider_index] -= 1
+                    if not unranked_customer_counts[provider_index]:
+                        next_frontier.append(provider_index)
+            frontier = next_frontier
+            rank += 1
+
+        ases = as_graph_json["ases"]
+        for i, asn in enumerate(asns):
+            ases[asn]["propagation_rank"] = ranks[i]
 
     @staticmethod
     def assign_as_graph_propagation_ranks(
@@ -165,18 +236,17 @@ class ASGraphUtils:
     ) -> None:
         """Orders ASes by rank"""
 
-        max_rank: int = max(
-            x["propagation_rank"] for x in as_graph_json["ases"].values()
-        )
+        ases = as_graph_json["ases"]
+        max_rank: int = max(x["propagation_rank"] for x in ases.values())
         # Create a list of empty lists
         # Ignore types here for speed purposes
         ranks: list[list[int]] = [list() for _ in range(max_rank + 1)]
-        # Append the ASes into their proper rank
-        for asn, as_info in as_graph_json["ases"].items():
-            ranks[as_info["propagation_rank"]].append(asn)
+        # Append the ASes into their proper rank. Iterating over sorted ASNs
+        # means each rank is already sorted
+        for asn in sorted(ases):
+            ranks[ases[asn]["propagation_rank"]].append(asn)
 
-        # Create tuple ranks
-        as_graph_json["propagation_rank_asns"] = [sorted(rank) for rank in ranks]
+        as_graph_json["propagation_rank_asns"] = ranks
 
     ####################
     # ASN groups funcs #
@@ -191,81 +261,113 @@ class ASGraphUtils:
     ) -> None:
         """Gets ASN groups. Used for choosing attackers from stubs, adopters, etc."""
 
-        asn_to_as: dict[int, AS] = {
-            asn: AS.from_json(as_info) for asn, as_info in as_graph_json["ases"].items()
-        }
-
-        asn_group_filters: dict[str, Callable[[dict[int, AS]], frozenset[int]]] = dict(
-            **ASGraphUtils.get_default_as_group_filters(),
-            **additional_asn_group_filters,
+        asn_groups: dict[str, frozenset[int]] = ASGraphUtils.get_default_asn_groups(
+            as_graph_json
         )
-
-        asn_groups: frozendict[str, frozenset[int]] = frozendict(
-            {
-                asn_group_key: filter_func(asn_to_as)
-                for asn_group_key, filter_func in asn_group_filters.items()
+        # Only create every AS (and it's policy) when a filter actually needs them
+        if additional_asn_group_filters:
+            asn_to_as: dict[int, AS] = {
+                asn: AS.from_json(as_info)
+                for asn, as_info in as_graph_json["ases"].items()
             }
-        )
+            for asn_group_key, filter_func in additional_asn_group_filters.items():
+                asn_groups[asn_group_key] = filter_func(asn_to_as)
 
         as_graph_json["asn_groups"] = {
             k: list(asn_group) for k, asn_group in asn_groups.items()
         }
 
     @staticmethod
-    def get_default_as_group_filters() -> dict[
-        str, Callable[[dict[int, AS]], frozenset[int]]
-    ]:
-        """Returns the default filter functions for AS groups"""
+    def get_default_asn_groups(
+        as_graph_json: dict[str, Any],
+    ) -> dict[str, frozenset[int]]:
+        """Returns the default AS groups
 
-        def ixp_filter(asn_to_as: dict[int, AS]) -> frozenset[int]:
-            return frozenset(asn for asn, as_ in asn_to_as.items() if as_.ixp)
+        Reads each AS's flags straight from the JSON in a single pass, rather
+        than creating every AS. Each group is built in the JSON's AS order,
+        since the frozenset's iteration order (and so which ASes get randomly
+        chosen from the group) depends on the order ASNs are added
+        """
 
-        def stub_no_ixp_filter(asn_to_as: dict[int, AS]) -> frozenset[int]:
-            return frozenset(
-                asn for asn, as_ in asn_to_as.items() if as_.stub and not as_.ixp
-            )
+        ixps: list[int] = []
+        stubs: list[int] = []
+        multihomed: list[int] = []
+        stubs_or_mh: list[int] = []
+        tier_1: list[int] = []
+        etc: list[int] = []
+        transit: list[int] = []
 
-        def multihomed_no_ixp_filter(asn_to_as: dict[int, AS]) -> frozenset[int]:
-            return frozenset(
-                asn for asn, as_ in asn_to_as.items() if as_.multihomed and not as_.ixp
+        for asn, as_info in as_graph_json["ases"].items():
+            if as_info.get("ixp", False):
+                ixps.append(asn)
+                continue
+            # Neighbor ASNs in the JSON come from sets, so they are unique
+            customer_asns = as_info.get("customer_asns", ())
+            peer_asns = as_info.get("peer_asns", ())
+            provider_asns = as_info.get("provider_asns", ())
+            # Same definitions as AS._set_neighbor_asn_attrs (RFC1772)
+            is_stub = len({*customer_asns, *peer_asns, *provider_asns}) == 1
+            is_multihomed = (
+                not customer_asns and len(peer_asns) + len(provider_asns) > 1
             )
+            is_tier_1 = as_info.get("tier_1", False)
+            if is_stub:
+                stubs.append(asn)
+            if is_multihomed:
+                multihomed.append(asn)
+            if is_stub or is_multihomed:
+                stubs_or_mh.append(asn)
+            if is_tier_1:
+                tier_1.append(asn)
+            if not (is_stub or is_multihomed or is_tier_1):
+                etc.append(asn)
+            if customer_asns and (
+                len(customer_asns) + len(peer_asns) + len(provider_asns) > 1
+            ):
+                transit.append(asn)
 
-        def stubs_or_multihomed_no_ixp_filter(
-            asn_to_as: dict[int, AS],
-        ) -> frozenset[int]:
-            return frozenset(
-                asn
-                for asn, as_ in asn_to_as.items()
-                if (as_.stub or as_.multihomed) and not as_.ixp
-            )
+        return {
+            ASNGroups.IXPS: frozenset(ixps),
+            ASNGroups.STUBS: frozenset(stubs),
+            ASNGroups.MULTIHOMED: frozenset(multihomed),
+            ASNGroups.STUBS_OR_MH: frozenset(stubs_or_mh),
+            ASNGroups.TIER_1: frozenset(tier_1),
+            ASNGroups.ETC: frozenset(etc),
+            ASNGroups.TRANSIT: frozenset(transit),
+            ASNGroups.ALL_WOUT_IXPS: frozenset(as_graph_json["ases"]),
+        }
 
-        def tier_1_no_ixp_filter(asn_to_as: dict[int, AS]) -> frozenset[int]:
-            return frozenset(
-                asn for asn, as_ in asn_to_as.items() if as_.tier_1 and not as_.ixp
-            )
+    @staticmethod
+    def get_default_as_group_filters() -> dict[
+        str, Callable[[dict[int, AS]], frozenset[int]]
+    ]:
+        """Returns the default filter functions for AS groups
 
-        def etc_no_ixp_filter(asn_to_as: dict[int, AS]) -> frozenset[int]:
-            return frozenset(
-                asn
-                for asn, as_ in asn_to_as.items()
-                if not (as_.stub or as_.multihomed or as_.tier_1 or as_.ixp)
-            )
+        Kept for backwards compatibility. add_asn_groups uses
+        get_default_asn_groups instead, which doesn't need the AS objects
+        """
 
-        def transit_no_ixp_filter(asn_to_as: dict[int, AS]) -> frozenset[int]:
-            return frozenset(
-                asn for asn, as_ in asn_to_as.items() if as_.transit and not as_.ixp
-            )
+        def get_filter(
+            asn_group_key: str,
+        ) -> Callable[[dict[int, AS]], frozenset[int]]:
+            def asn_group_filter(asn_to_as: dict[int, AS]) -> frozenset[int]:
+                as_graph_json = {
+                    "ases": {asn: as_.to_json() for asn, as_ in asn_to_as.items()}
+                }
+                return ASGraphUtils.get_default_asn_groups(as_graph_json)[asn_group_key]
 
-        def all_no_ixp_filter(asn_to_as: dict[int, AS]) -> frozenset[int]:
-            return frozenset(asn_to_as.keys())
+            return asn_group_filter
 
         return {
-            ASNGroups.IXPS: ixp_filter,
-            ASNGroups.STUBS: stub_no_ixp_filter,
-            ASNGroups.MULTIHOMED: multihomed_no_ixp_filter,
-            ASNGroups.STUBS_OR_MH: stubs_or_multihomed_no_ixp_filter,
-            ASNGroups.TIER_1: tier_1_no_ixp_filter,
-            ASNGroups.ETC: etc_no_ixp_filter,
-            ASNGroups.TRANSIT: transit_no_ixp_filter,
-            ASNGroups.ALL_WOUT_IXPS: all_no_ixp_filter,
+            asn_group_key: get_filter(asn_group_key)
+            for asn_group_key in (
+                ASNGroups.IXPS,
+                ASNGroups.STUBS,
+                ASNGroups.MULTIHOMED,
+                ASNGroups.STUBS_OR_MH,
+                ASNGroups.TIER_1,
+                ASNGroups.ETC,
+                ASNGroups.TRANSIT,
+                ASNGroups.ALL_WOUT_IXPS,
+            )
         }
@@ -1,5 +1,4 @@
-from functools import cached_property
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Any, ClassVar, cast
 from weakref import proxy
 
 from bgpsimulator.shared import Relationships
@@ -12,6 +11,31 @@ if TYPE_CHECKING:
 class AS:
     """Autonomous System class. Contains attributes of an AS"""
 
+    # There are tens of thousands of these, so slots keep them small
+    __slots__ = (
+        "asn",
+        "peer_asns",
+        "provider_asns",
+        "customer_asns",
+        "peers",
+        "providers",
+        "customers",
+        "tier_1",
+        "ixp",
+        "provider_cone_asns",
+        "propagation_rank",
+        "policy",
+        "as_graph",
+        "stub",
+        "multihomed",
+        "transit",
+        "stubs",
+        "neighbors",
+        "neighbor_asns",
+        "_neighbors_by_rel",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         asn: int,
@@ -32,9 +56,10 @@ class AS:
         self.provider_asns: set[int] = provider_asns or set()
         self.customer_asns: set[int] = customer_asns or set()
 
-        self.peers: list[AS] = []
-        self.providers: list[AS] = []
-        self.customers: list[AS] = []
+        # Tuples, since these are only ever iterated, and are smaller than lists
+        self.peers: tuple[AS, ...] = ()
+        self.providers: tuple[AS, ...] = ()
+        self.customers: tuple[AS, ...] = ()
 
         # Read Caida's paper to understand these
         self.tier_1: bool = tier_1
@@ -43,115 +68,167 @@ class AS:
         # Propagation rank. 0 is a leaf, highest is the input clique/t1 ASes
         self.propagation_rank: int | None = propagation_rank
 
-        # Hash in advance and only once since this gets called a lot
-        self.hashed_asn = hash(self.asn)
+        # Set properly in set_relations, once the AS graph exists
+        self.stubs: tuple[AS, ...] = ()
+        self.neighbors: tuple[AS, ...] = ()
+        self._set_neighbors_by_rel()
+        self._set_neighbor_asn_attrs()
 
         self.policy: Policy = (
             Policy.from_json(policy_json, self) if policy_json else Policy(self)
         )
 
         # This is useful for some policies to have knowledge of the graph
-        # Cast this here to avoid having to write the weakref everywhere
-        if as_graph is not None:
-            self.as_graph: ASGraph = cast("ASGraph", proxy(as_graph))
-        else:
-            # Ignoring this because it gets set properly immediatly
-            self.as_graph = None  # type: ignore
+        # A plain reference rather than a weakref proxy, since proxy dispatch
+        # is slow. This creates a reference cycle, see ASGraph.close
+        # Ignoring this because it gets set properly immediatly
+        self.as_graph: ASGraph = as_graph  # type: ignore
 
     def set_relations(self) -> None:
         """Sets the relations for the AS"""
-        if not self.as_graph:
+        if self.as_graph is None:
             raise ValueError("AS graph not set")
 
-        self.peers = [cast("AS", proxy(self.as_graph[asn])) for asn in self.peer_asns]
-        self.providers = [
-            cast("AS", proxy(self.as_graph[asn])) for asn in self.provider_asns
-        ]
-        self.customers = [
-            cast("AS", proxy(self.as_graph[asn])) for asn in self.customer_asns
-        ]
-
-    def get_neighbor(self, rel: Relationships) -> list["AS"]:
-        """Returns the neighbors of the AS based on the relationship enum"""
-
-        if rel == Relationships.PEERS:
-            return self.peers
-        elif rel == Relationships.PROVIDERS:
-            return self.providers
-        elif rel == Relationships.CUSTOMERS:
-            return self.customers
-        else:
-            raise ValueError(f"Invalid relationship: {rel}")
+        # Look up the as_dict directly, since the graph's __getitem__ is
+        # a Python level method
+        as_dict = self.as_graph.as_dict
+        self.peers = tuple([cast("AS", proxy(as_dict[x])) for x in self.peer_asns])
+        self.providers = tuple(
+            [cast("AS", proxy(as_dict[x])) for x in self.provider_asns]
+        )
+        self.customers = tuple(
+            [cast("AS", proxy(as_dict[x])) for x in self.customer_asns]
+        )
 
-    def __lt__(self, as_obj: Any) -> bool:
-        if isinstance(as_obj, AS):
-            return self.asn < as_obj.asn
-        else:
-            return NotImplemented
+        # These are accessed constantly during propagation, so compute them
+        # once here rather than on every access
+        self._set_neighbor_asn_attrs()
+        self.neighbors = (*self.customers, *self.peers, *self.providers)
+        self._set_neighbors_by_rel()
+        # NOTE: customers must all be initialized prior to this for stub
+        self.stubs = tuple(x for x in self.customers if x.stub)
 
-    def __eq__(self, other: Any) -> bool:
-        if isinstance(other, AS):
-            return self.to_json() == other.to_json()
-        else:
-            return NotImplemented
+    def _set_neighbor_asn_attrs(self) -> None:
+        """Sets attrs derived from the neighbor ASN sets
 
-    def __hash__(self) -> int:
-        return self.hashed_asn
+        These only use the ASN sets (not the AS objects) so that they can be used
+        during graph construction. If the ASN sets are modified after init, this
+        must be called again (set_relations does this automatically)
+        """
 
-    @cached_property
-    def stub(self) -> bool:
-        """Returns True if AS is a stub by RFC1772
+        self.neighbor_asns: set[int] = (
+            self.customer_asns | self.peer_asns | self.provider_asns
+        )
+        # RFC1772
+        self.stub: bool = len(self.neighbor_asns) == 1
+        # RFC1772
+        self.multihomed: bool = (
+            len(self.customer_asns) == 0
+            and len(self.peer_asns) + len(self.provider_asns) > 1
+        )
+        # RFC1772
+        self.transit: bool = (
+            len(self.customer_asns) > 0
+            and len(self.customer_asns) + len(self.peer_asns) + len(self.provider_asns)
+            > 1
+        )
 
-        Use neighbor_asns instead of neighbors so you can use this
-        during graph construction
-        """
+    # These hold weakref proxies (which can't be pickled) or the graph itself,
+    # so they are dropped when pickling and restored by the ASGraph when it's
+    # unpickled
+    _unpicklable_attrs: ClassVar[frozenset[str]] = frozenset(
+        {
+            "as_graph",
+            "peers",
+            "providers",
+            "customers",
+            "stubs",
+            "neighbors",
+            "_neighbors_by_rel",
+            "__weakref__",
+        }
+    )
 
-        return len(self.neighbor_asns) == 1
+    # Attrs that are pickled, in the order of the pickled state tuple
+    _pickled_attrs: ClassVar[tuple[str, ...]] = tuple(
+        sorted(frozenset(__slots__) - _unpicklable_attrs, key=__slots__.index)
+    )
 
-    @cached_property
-    def multihomed(self) -> bool:
-        """Returns True if AS is multihomed by RFC1772
+    def __getstate__(self) -> tuple[Any, ...]:
+        """Returns the AS state for pickling, without any weakref proxies
 
-        Use customer_asns instead of customers so you can use this
-        during graph construction
+        A tuple in _pickled_attrs order rather than a dict, since otherwise
+        every one of the tens of thousands of ASes repeats the attr names
         """
 
-        return (
-            len(self.customer_asns) == 0
-            and len(self.peer_asns) + len(self.provider_asns) > 1
-        )
+        return tuple([getattr(self, attr) for attr in self._pickled_attrs])
 
-    @cached_property
-    def transit(self) -> bool:
-        """Returns True if AS is a transit AS by RFC1772
+    def __setstate__(self, state: tuple[Any, ...]) -> None:
+        """Restores the AS from a pickle
 
-        Use customer_asns instead of customers so you can use this
-        during graph construction
+        set_relations must be called once the as_graph is set
         """
 
-        return (
-            len(self.customer_asns) > 0
-            and len(self.customer_asns) + len(self.peer_asns) + len(self.provider_asns)
-            > 1
+        for attr, value in zip(self._pickled_attrs, state, strict=True):
+            setattr(self, attr, value)
+        self.as_graph = None  # type: ignore
+        self.peers = ()
+        self.providers = ()
+        self.customers = ()
+        self.stubs = ()
+        self.neighbors = ()
+        self._set_neighbors_by_rel()
+        self.policy.as_ = cast("AS", proxy(self))
+
+    def _set_neighbors_by_rel(self) -> None:
+        """Sets the neighbor lists indexed by Relationships value for get_neighbor"""
+
+        # Relationships start at one, so index 0 isn't a relationship
+        self._neighbors_by_rel: tuple[tuple[AS, ...] | None, ...] = (
+            None,
+            self.providers,
+            self.peers,
+            self.customers,
         )
 
-    @cached_property
-    def stubs(self) -> list["AS"]:
-        """Returns a list of any stubs connected to that AS"""
+    def get_neighbor(self, rel: Relationships) -> tuple["AS", ...]:
+        """Returns the neighbors of the AS based on the relationship enum"""
 
-        return [x for x in self.customers if x.stub]
+        try:
+            neighbors = self._neighbors_by_rel[rel]
+        except IndexError:
+            neighbors = None
+        if neighbors is None:
+            raise ValueError(f"Invalid relationship: {rel}")
+        return neighbors
 
-    @cached_property
-    def neighbors(self) -> list["AS"]:
-        """Returns customers + peers + providers"""
+    def __lt__(self, as_obj: Any) -> bool:
+        if isinstance(as_obj, AS):
+            return self.asn < as_obj.asn
+        else:
+            return NotImplemented
 
-        return self.customers + self.peers + self.providers
+    def __eq__(self, other: Any) -> bool:
+        """Compares the AS's structure and policy without building JSON"""
 
-    @cached_property
-    def neighbor_asns(self) -> set[int]:
-        """Returns neighboring ASNs (useful for ASRA)"""
+        if isinstance(other, AS):
+            return (
+                self.asn == other.asn
+                and self.peer_asns == other.peer_asns
+                and self.provider_asns == other.provider_asns
+                and self.customer_asns == other.customer_asns
+                and self.tier_1 == other.tier_1
+                and self.ixp == other.ixp
+                and self.provider_cone_asns == other.provider_cone_asns
+                and self.propagation_rank == other.propagation_rank
+                and self.policy == other.policy
+            )
+        else:
+            return NotImplemented
 
-        return self.customer_asns | self.peer_asns | self.provider_asns
+    def __hash__(self) -> int:
+        # An int (less than sys.hash_info.modulus) is its own hash
+        return self.asn
 
     ##############
     # JSON funcs #
@@ -174,21 +251,36 @@ class AS:
 
     @classmethod
     def from_json(
-        cls, json_obj: dict[str, Any], as_graph: "ASGraph | None" = None
+        cls,
+        json_obj: dict[str, Any],
+        as_graph: "ASGraph | None" = None,
+        asn_interner: dict[int, int] | None = None,
     ) -> "AS":
-        """Converts the AS to a JSON object"""
+        """Converts the AS to a JSON object
+
+        asn_interner maps each ASN to a canonical int object, so that ASN sets
+        across all ASes share int objects rather than duplicating them
+        """
+
+        if asn_interner is None:
+            asn_interner = dict()
+        intern = asn_interner.setdefault
 
         return cls(
             as_graph=as_graph,
-            asn=int(json_obj["asn"]),
-            customer_asns=set([int(x) for x in json_obj.get("customer_asns", [])]),
-            peer_asns=set([int(x) for x in json_obj.get("peer_asns", [])]),
-            provider_asns=set([int(x) for x in json_obj.get("provider_asns", [])]),
+            asn=intern(int(json_obj["asn"]), int(json_obj["asn"])),
+            customer_asns={
+                intern(x, x) for x in map(int, json_obj.get("customer_asns", []))
+            },
+            peer_asns={intern(x, x) for x in map(int, json_obj.get("peer_asns", []))},
+            provider_asns={
+                intern(x, x) for x in map(int, json_obj.get("provider_asns", []))
+            },
             tier_1=json_obj.get("tier_1", False),
             ixp=json_obj.get("ixp", False),
-            provider_cone_asns=set(
-                [int(x) for x in json_obj.get("provider_cone_asns", [])]
-            ),
+            provider_cone_asns={
+                intern(x, x) for x in map(int, json_obj.get("provider_cone_asns", []))
+            },
             propagation_rank=int(json_obj.get("propagation_rank"))
             if json_obj.get("propagation_rank")
             else None,
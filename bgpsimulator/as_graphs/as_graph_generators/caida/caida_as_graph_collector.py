@@ -6,9 +6,6 @@ from pathlib import Path
 from tempfile import TemporaryDirectory
 from typing import cast
 
-import requests
-from bs4 import BeautifulSoup as Soup
-
 from bgpsimulator.shared import (
     SINGLE_DAY_CACHE_DIR,
     NoCAIDAURLError,
@@ -105,6 +102,11 @@ class CAIDAASGraphCollector:
     def _get_hrefs(self, url: str) -> list[str]:
         """Returns hrefs from a tags at a given url"""
 
+        # Only needed when downloading (the graph is usually cached), and
+        # requests and bs4 are slow to import
+        import requests  # noqa: PLC0415
+        from bs4 import BeautifulSoup as Soup  # noqa: PLC0415
+
         # Query URL
         with requests.get(url, stream=True, timeout=30) as r:
             # Check for errors
@@ -122,6 +124,8 @@ class CAIDAASGraphCollector:
     def _download_bz2_file(self, url: str, bz2_path: Path) -> None:
         """Downloads bz2 file from caida"""
 
+        import requests  # noqa: PLC0415
+
         # https://stackoverflow.com/a/39217788/8903959
         # Download the file
         with requests.get(url, stream=True, timeout=5) as r:
@@ -1,4 +1,8 @@
+import gc
 import json
+import os
+import pickle
+from collections import defaultdict
 from pathlib import Path
 from typing import Any, Callable
 
@@ -10,10 +14,15 @@ from bgpsimulator.simulation_engine.policy import Policy
 
 from .caida_as_graph_collector import CAIDAASGraphCollector
 
+# Indexing bytes gives an int
+COMMENT_BYTE = ord("#")
+
 
 class CAIDAASGraphJSONConverter:
     """Converts the serial-2 to a JSON file that can be ingested to create a graph"""
 
+    __slots__ = ("cache_dir",)
+
     def __init__(self, cache_dir: Path = SINGLE_DAY_CACHE_DIR) -> None:
         self.cache_dir: Path = cache_dir
 
@@ -31,6 +40,8 @@ class CAIDAASGraphJSONConverter:
         2. Convert the CAIDA file to JSON
         3. Write to JSON path if it is set
         4. Return JSON info for speed (rather than rereading it later)
+
+        The JSON is also cached as a pickle, which is much faster to load
         """
 
         caida_as_graph_path = caida_as_graph_path or CAIDAASGraphCollector().run()
@@ -44,13 +55,32 @@ class CAIDAASGraphJSONConverter:
                 additional_asn_group_filters,
                 PolicyCls,
             )
+        return self._get_as_graph_info(json_cache_path), json_cache_path
+
+    def _get_as_graph_info(self, json_cache_path: Path) -> dict[str, Any]:
+        """Returns the AS graph info, from the pickle if it's up to date
+
+        Otherwise the JSON is loaded, and the pickle is (re)written from it.
+        Nothing is cached in memory, so every caller gets its own dict to modify
+        (and the OS already caches the pickle file)
+        """
+
+        pickle_cache_path = json_cache_path.with_suffix(".pickle")
+        # Only use the pickle if it wasn't made from an older JSON
+        if (
+            pickle_cache_path.exists()
+            and pickle_cache_path.stat().st_mtime_ns
+            >= json_cache_path.stat().st_mtime_ns
+        ):
+            return self._load_as_graph_pickle(pickle_cache_path)
         try:
             as_graph_info = json.loads(json_cache_path.read_text())
             # Must convert keys to ints when coming from JSON
             as_graph_info["ases"] = {
                 int(asn): info for asn, info in as_graph_info["ases"].items()
             }
-            return as_graph_info, json_cache_path
+            self._write_as_graph_pickle(as_graph_info, pickle_cache_path)
+            return as_graph_info
         except json.JSONDecodeError:
             bgpsimulator_logger.error(
                 f"JSON file {json_cache_path} is corrupted, it will now be deleted"
@@ -69,72 +99,159 @@ class CAIDAASGraphJSONConverter:
     ) -> None:
         """Writes as graph JSON from CAIDAs raw file"""
 
+        # Neighbors are appended to flat per relationship lists while parsing,
+        # and only turned into (per AS) sets once, when the ASes are created
+        peer_asns: defaultdict[int, list[int]] = defaultdict(list)
+        provider_asns: defaultdict[int, list[int]] = defaultdict(list)
+        customer_asns: defaultdict[int, list[int]] = defaultdict(list)
+        tier_1_asns: set[int] = set()
+        ixp_asns: set[int] = set()
+        # Stream the lines as bytes, rather than reading the entire file into
+        # one (decoded) str and then into a list of lines
+        with caida_as_graph_path.open("rb") as f:
+            for line in f:
+                # Not a comment, must be a relationship. Almost every line is one
+                # of these, so check the first byte before any prefix matching
+                if line[0] != COMMENT_BYTE:
+                    # Only split off the two ASNs. The source is never used, and
+                    # the relationship can be checked without splitting it off
+                    fields = line.split(b"|", 2)
+                    # Extract all customer provider pairs
+                    if fields[2].startswith(b"-1"):
+                        self._extract_provider_customers(
+                            fields, provider_asns, customer_asns
+                        )
+                    # Extract all peers
+                    else:
+                        self._extract_peers(fields, peer_asns)
+                # Get Caida input clique. See paper on site for what this is
+                elif line.startswith(b"# input clique"):
+                    self._extract_tier_1_asns(line, tier_1_asns)
+                # Get detected Caida IXPs. See paper on site for what this is
+                elif line.startswith(b"# IXP ASes"):
+                    self._extract_ixp_asns(line, ixp_asns)
+
         asn_to_as: dict[int, AS] = dict()
-        lines = caida_as_graph_path.read_text().splitlines()
-        for line in lines:
-            # Get Caida input clique. See paper on site for what this is
-            if line.startswith("# input clique"):
-                self._extract_tier_1_asns(line, asn_to_as)
-            # Get detected Caida IXPs. See paper on site for what this is
-            elif line.startswith("# IXP ASes"):
-                self._extract_ixp_asns(line, asn_to_as)
-            # Not a comment, must be a relationship
-            elif not line.startswith("#"):
-                # Extract all customer provider pairs
-                if "-1" in line:
-                    self._extract_provider_customers(line, asn_to_as)
-                # Extract all peers
-                else:
-                    self._extract_peers(line, asn_to_as)
+        for asn in sorted(
+            {*peer_asns, *provider_asns, *customer_asns, *tier_1_asns, *ixp_asns}
+        ):
+            as_ = asn_to_as[asn] = AS(
+                asn=asn, tier_1=asn in tier_1_asns, ixp=asn in ixp_asns
+            )
+            # Set after init, since only the ASN sets are needed for the JSON, and
+            # the attrs derived from them at init would go unused here
+            as_.peer_asns = set(peer_asns.get(asn, ()))
+            as_.provider_asns = set(provider_asns.get(asn, ()))
+            as_.customer_asns = set(customer_asns.get(asn, ()))
 
         final_json: dict[str, Any] = {
             "ases": {k: as_.to_json() for k, as_ in asn_to_as.items()},
         }
         ASGraphUtils.add_extra_setup(final_json, additional_asn_group_filters)
 
-        with json_cache_path.open("w") as f:
-            # add separators to make JSON as short as possible
-            # ensure_ascii set to false also gives a speed boost
-            json.dump(final_json, f, separators=(",", ":"), ensure_ascii=False)
+        self._stream_as_graph_json(final_json, json_cache_path)
+
+    def _stream_as_graph_json(
+        self, final_json: dict[str, Any], json_cache_path: Path
+    ) -> None:
+        """Writes the JSON one AS at a time
+
+        Encoding the whole graph at once would hold the entire JSON str (and
+        it's encoded bytes) in memory alongside the dict it came from
+        """
+
+        # add separators to make JSON as short as possible
+        # ensure_ascii set to false also gives a speed boost
+        # encoder.encode rather than json.dump, since only the one shot encoding
+        # uses the C encoder (json.dump falls back to the pure python one)
+        encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+        # Write to a tmp file first so a partially written JSON is never read
+        tmp_path = json_cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_path.open("w") as f:
+            f.write('{"ases":{')
+            for i, (asn, as_json) in enumerate(final_json["ases"].items()):
+                if i:
+                    f.write(",")
+                f.write(f'"{asn}":')
+                f.write(encoder.encode(as_json))
+            f.write("}")
+            for key, value in final_json.items():
+                if key != "ases":
+                    f.write(f",{encoder.encode(key)}:{encoder.encode(value)}")
+            f.write("}")
+        tmp_path.replace(json_cache_path)
+
+    @staticmethod
+    def _load_as_graph_pickle(pickle_cache_path: Path) -> dict[str, Any]:
+        """Loads the cached JSON info from the pickle
+
+        Unpickling creates millions of small containers, which otherwise
+        trigger constant (and useless) full garbage collections
+        """
+
+        as_graph_pickle_bytes = pickle_cache_path.read_bytes()
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return pickle.loads(as_graph_pickle_bytes)  # noqa: S301
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    @staticmethod
+    def _write_as_graph_pickle(
+        as_graph_info: dict[str, Any], pickle_cache_path: Path
+    ) -> None:
+        """Caches the JSON info as a pickle"""
+
+        # Write to a tmp file first so a partially written pickle is never read
+        tmp_path = pickle_cache_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(
+            pickle.dumps(as_graph_info, protocol=pickle.HIGHEST_PROTOCOL)
+        )
+        tmp_path.replace(pickle_cache_path)
 
     #################
     # Parsing funcs #
     #################
 
-    def _extract_tier_1_asns(self, line: str, asn_to_as: dict[int, AS]) -> None:
-        """Adds all ASNs within input clique line to ases dict"""
+    def _extract_tier_1_asns(self, line: bytes, tier_1_asns: set[int]) -> None:
+        """Adds all ASNs within input clique line to the tier 1 ASNs"""
 
         # Gets all input ASes for clique
-        for asn in line.split(":")[-1].strip().split(" "):
-            as_ = asn_to_as.setdefault(int(asn), AS(asn=int(asn)))
-            as_.tier_1 = True
+        tier_1_asns.update(map(int, line.split(b":")[-1].strip().split(b" ")))
 
-    def _extract_ixp_asns(self, line: str, asn_to_as: dict[int, AS]) -> None:
-        """Adds all ASNs that are detected IXPs to ASes dict"""
+    def _extract_ixp_asns(self, line: bytes, ixp_asns: set[int]) -> None:
+        """Adds all ASNs that are detected IXPs to the IXP ASNs"""
 
         # Get all IXPs that Caida lists
-        for asn in line.split(":")[-1].strip().split(" "):
-            as_ = asn_to_as.setdefault(int(asn), AS(asn=int(asn)))
-            as_.ixp = True
-
-    def _extract_provider_customers(self, line: str, asn_to_as: dict[int, AS]) -> None:
-        """Extracts provider customers: <provider-as>|<customer-as>|-1"""
+        ixp_asns.update(map(int, line.split(b":")[-1].strip().split(b" ")))
 
-        provider_asn, customer_asn, _, source = line.split("|")
+    def _extract_provider_customers(
+        self,
+        fields: list[bytes],
+        provider_asns: defaultdict[int, list[int]],
+        customer_asns: defaultdict[int, list[int]],
+    ) -> None:
+        """Extracts provider customers: <provider-as>|<customer-as>|-1|<source>"""
 
-        provider_as = asn_to_as.setdefault(int(provider_asn), AS(asn=int(provider_asn)))
-        provider_as.customer_asns.add(int(customer_asn))
+        provider_asn_str, customer_asn_str, _rel_and_source = fields
+        # Parse each ASN only once
+        provider_asn = int(provider_asn_str)
+        customer_asn = int(customer_asn_str)
 
-        customer_as = asn_to_as.setdefault(int(customer_asn), AS(asn=int(customer_asn)))
-        customer_as.provider_asns.add(int(provider_asn))
+        customer_asns[provider_asn].append(customer_asn)
+        provider_asns[customer_asn].append(provider_asn)
 
-    def _extract_peers(self, line: str, asn_to_as: dict[int, AS]) -> None:
+    def _extract_peers(
+        self, fields: list[bytes], peer_asns: defaultdict[int, list[int]]
+    ) -> None:
         """Extracts peers: <peer-as>|<peer-as>|0|<source>"""
 
-        peer1_asn, peer2_asn, _, source = line.split("|")
-
-        peer1_as = asn_to_as.setdefault(int(peer1_asn), AS(asn=int(peer1_asn)))
-        peer1_as.peer_asns.add(int(peer2_asn))
+        peer1_asn_str, peer2_asn_str, _rel_and_source = fields
+        # Parse each ASN only once
+        peer1_asn = int(peer1_asn_str)
+        peer2_asn = int(peer2_asn_str)
 
-        peer2_as = asn_to_as.setdefault(int(peer2_asn), AS(asn=int(peer2_asn)))
-        peer2_as.peer_asns.add(int(peer1_asn))
+        peer_asns[peer1_asn].append(peer2_asn)
+        peer_asns[peer2_asn].append(peer1_asn)
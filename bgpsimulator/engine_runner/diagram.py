@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING
 
 from graphviz import Digraph
 
-from bgpsimulator.shared import Outcomes, Settings
+from bgpsimulator.shared import Outcomes, Prefix, Settings
 from bgpsimulator.simulation_engine import SimulationEngine
 from bgpsimulator.simulation_framework import Scenario
 
@@ -17,6 +17,11 @@ class Diagram:
 
     def __init__(self) -> None:
         self.dot: Digraph = Digraph(format="png")
+        # Every AS displays the same handful of prefixes, so only format them once
+        self._prefix_displays: dict[Prefix, str] = dict()
+        # Each ASN is used as a str for its node, every edge, and its rank, so
+        # only convert each once. Set in run
+        self._asn_strs: dict[int, str] = dict()
 
     def run(
         self,
@@ -31,6 +36,7 @@ class Diagram:
         dpi: int | None = None,
     ) -> None:
         """Runs the diagram"""
+        self._asn_strs = {as_obj.asn: str(as_obj.asn) for as_obj in engine.as_graph}
         self._add_legend(packet_outcomes, scenario)
         display_full_prefix_bool = self._get_display_full_prefix_bool(scenario)
         self._add_ases(engine, packet_outcomes, scenario, display_full_prefix_bool)
@@ -59,7 +65,9 @@ class Diagram:
         looping_count = sum(
             1 for x in packet_outcomes.values() if x == Outcomes.DATA_PLANE_LOOP.value
         )
-        html = f"""<
+        # Join a list of parts, rather than repeatedly copying the html with +=
+        html_parts = [
+            f"""<
               <TABLE BORDER="0" CELLBORDER="1" CELLSPACING="0" CELLPADDING="4">
               <TR>
           <TD COLSPAN="2" BORDER="0">(For Destination of {scenario.dest_ip_addr})</TD>
@@ -73,36 +81,38 @@ class Diagram:
                 <TD>{victim_success_count}</TD>
               </TR>
         """
+        ]
         if disconnect_count:
-            html += f"""
+            html_parts.append(f"""
             <TR>
             <TD BGCOLOR="grey:white">&#10041; DISCONNECTED &#10041;</TD>
                     <TD>{disconnect_count}</TD>
                   </TR>
-            """
+            """)
         if looping_count:
-            html += f"""
+            html_parts.append(f"""
             <TR>
             <TD BGCOLOR="yellow:white">&#8734; LOOPING &#8734;</TD>
                     <TD>{disconnect_count}</TD>
                   </TR>
-            """
+            """)
 
         # ROAs takes up the least space right underneath the legend
         # which is why we have this here instead of a separate node
-        html += """
+        html_parts.append("""
               <TR>
                 <TD COLSPAN="2" BORDER="0">ROAs (prefix, origin, max_len)</TD>
               </TR>
-              """
+              """)
         for roa in scenario.roas:
-            html += f"""
+            html_parts.append(f"""
               <TR>
                 <TD>{roa.prefix}</TD>
                 <TD>{roa.origin}</TD>
                 <TD>{roa.max_length}</TD>
-              </TR>"""
-        html += """</TABLE>>"""
+              </TR>""")
+        html_parts.append("""</TABLE>>""")
+        html = "".join(html_parts)
 
         self.dot.node(
             "Legend",
@@ -156,7 +166,7 @@ class Diagram:
 
         kwargs = self._get_kwargs(as_obj, engine, packet_outcomes, scenario)
 
-        self.dot.node(str(as_obj.asn), html, **kwargs)
+        self.dot.node(self._asn_strs[as_obj.asn], html, **kwargs)
 
     def _get_html(
         self,
@@ -167,7 +177,7 @@ class Diagram:
         display_full_prefix_bool: bool,
     ) -> str:
         colspan = 3
-        asn_str = str(as_obj.asn)
+        asn_str = self._asn_strs[as_obj.asn]
         if as_obj.asn in scenario.legitimate_origin_asns:
             asn_str = "&#128519;" + asn_str + "&#128519;"
         elif as_obj.asn in scenario.attacker_asns:
@@ -179,43 +189,61 @@ class Diagram:
             if value and setting != Settings.BGP_FULL
         ]
 
-        html = f"""<
+        # Join a list of parts, rather than repeatedly copying the html with +=
+        html_parts = [
+            f"""<
             <TABLE BORDER="0" CELLBORDER="1" CELLSPACING="0" CELLPADDING="{colspan}">
             <TR>
             <TD COLSPAN="{colspan}" BORDER="0">{asn_str}</TD>
             </TR>
             """
+        ]
         for setting in used_settings:
-            html += f"""
+            html_parts.append(f"""
             <TR>
             <TD COLSPAN="{colspan}" BORDER="0">({setting.name})</TD>
-            </TR>"""
-        local_rib_anns = tuple(as_obj.policy.local_rib.values())
-        local_rib_anns = tuple(
-            sorted(
-                local_rib_anns,
-                key=lambda x: x.prefix.num_addresses,
-                reverse=True,
-            )
+            </TR>""")
+        # Largest prefixes first. The number of host bits orders the same as
+        # num_addresses, without computing 2 ** host bits for every comparison
+        local_rib_anns = sorted(
+            as_obj.policy.local_rib.values(),
+            key=lambda x: x.prefix.max_prefixlen - x.prefix.prefixlen,
+            reverse=True,
         )
         if len(local_rib_anns) > 0:
-            html += f"""<TR>
+            html_parts.append(f"""<TR>
                         <TD COLSPAN="{colspan}">Local RIB</TD>
-                      </TR>"""
+                      </TR>""")
 
             for ann in local_rib_anns:
-                if display_full_prefix_bool:
-                    prefix_display = str(ann.prefix)
-                else:
-                    prefix_display = "/" + str(ann.prefix).split("/")[-1]
-                path = "-".join(str(x) for x in ann.as_path)
-                html += f"""<TR>
+                prefix_display = self._prefix_displays.get(ann.prefix)
+                if prefix_display is None:
+                    prefix_display = self._get_prefix_display(
+                        ann.prefix, display_full_prefix_bool
+                    )
+                    self._prefix_displays[ann.prefix] = prefix_display
+                path = "-".join(map(str, ann.as_path))
+                html_parts.append(f"""<TR>
                             <TD COLSPAN="1">{prefix_display}</TD>
                             <TD COLSPAN="2">{path}</TD>
-                            """
-                html += """</TR>"""
-        html += "</TABLE>>"
-        return html
+                            """)
+                html_parts.append("""</TR>""")
+        html_parts.append("</TABLE>>")
+        return "".join(html_parts)
+
+    def _get_prefix_display(
+        self, prefix: Prefix, display_full_prefix_bool: bool
+    ) -> str:
+        """Returns the full prefix, or just the prefix len as an abbreviation
+
+        Uses the original str of the prefix, since IPv4 prefixes are stored as
+        IPv4-mapped IPv6 prefixes (so prefixlen would be off by 96)
+        """
+
+        if display_full_prefix_bool:
+            return str(prefix)
+        else:
+            return "/" + str(prefix).rpartition("/")[2]
 
     def _get_kwargs(
         self,
@@ -277,17 +305,19 @@ class Diagram:
     def _add_edges(self, engine: SimulationEngine):
         # Then add all connections to the graph
         # Starting with provider to customer
+        asn_strs = self._asn_strs
         for as_obj in engine.as_graph:
+            asn_str = asn_strs[as_obj.asn]
             # Add provider customer edges
             for customer_obj in as_obj.customers:
-                self.dot.edge(str(as_obj.asn), str(customer_obj.asn))
+                self.dot.edge(asn_str, asn_strs[customer_obj.asn])
             # Add peer edges
             # Only add if the largest asn is the curren as_obj to avoid dups
             for peer_obj in as_obj.peers:
                 if as_obj.asn > peer_obj.asn:
                     self.dot.edge(
-                        str(as_obj.asn),
-                        str(peer_obj.asn),
+                        asn_str,
+                        asn_strs[peer_obj.asn],
                         dir="none",
                         style="dashed",
                         penwidth="2",
@@ -399,17 +429,18 @@ class Diagram:
                     previous_asn: str | None = None
                     for asn in diagram_rank:
                         assert isinstance(asn, int)
-                        s.node(str(asn))
+                        asn_str = str(asn)
+                        s.node(asn_str)
                         if previous_asn is not None:
                             # Add invisible edge to maintain static order
-                            s.edge(str(previous_asn), str(asn), style="invis")
-                        previous_asn = str(asn)
+                            s.edge(previous_asn, asn_str, style="invis")
+                        previous_asn = asn_str
         else:
             for i, rank in enumerate(engine.as_graph.propagation_ranks):
                 g = Digraph(f"Propagation_rank_{i}")
                 g.attr(rank="same")
                 for as_obj in rank:
-                    g.node(str(as_obj.asn))
+                    g.node(self._asn_strs[as_obj.asn])
                 self.dot.subgraph(g)
 
     def _add_description(self, name: str, description: str) -> None:
@@ -10,6 +10,17 @@ class EngineRunConfig:
     Useful for tests and diagrams
     """
 
+    __slots__ = (
+        "name",
+        "prevent_naming_duplicates",
+        "diagram_desc",
+        "text",
+        "lab_text",
+        "scenario_config",
+        "as_graph",
+        "diagram_ranks",
+    )
+
     _used_names: ClassVar[set[str]] = set()
 
     def __init__(
@@ -26,10 +37,14 @@ class EngineRunConfig:
         self.name = name
         self.prevent_naming_duplicates: bool = prevent_naming_duplicates
 
-        # Useful for pytest, but turned off for the website
-        if self.name in EngineRunConfig._used_names and prevent_naming_duplicates:
-            raise ValueError(f"Name {self.name} already used")
-        EngineRunConfig._used_names.add(self.name)
+        # Useful for pytest, but turned off for the website (where names would
+        # otherwise pile up in _used_names for the life of the process)
+        if prevent_naming_duplicates:
+            # Add first and check if the set grew, rather than hashing twice
+            num_used_names = len(EngineRunConfig._used_names)
+            EngineRunConfig._used_names.add(self.name)
+            if len(EngineRunConfig._used_names) == num_used_names:
+                raise ValueError(f"Name {self.name} already used")
         self.diagram_desc = diagram_desc
         # Displayed in the website giant text box
         self.text = text
@@ -38,6 +53,12 @@ class EngineRunConfig:
         self.as_graph = as_graph
         self.diagram_ranks = diagram_ranks or []
 
+    @classmethod
+    def reset_used_names(cls) -> None:
+        """Forgets all names used so far, so that they can be reused"""
+
+        EngineRunConfig._used_names.clear()
+
     def __eq__(self, other):
         if isinstance(other, EngineRunConfig):
             return (
@@ -93,17 +93,20 @@ class EngineRunner:
 
         Always stores the guess, and optionally overwrites ground truth.
         """
-        self.engine_guess_path.write_text(json.dumps(engine.to_json()))
-        self.outcomes_guess_path.write_text(json.dumps(asn_to_packet_outcome_dict))
+        # Serialize once, even when the ground truth is written as well
+        engine_json_str = json.dumps(engine.to_json())
+        outcomes_json_str = json.dumps(asn_to_packet_outcome_dict)
+        self.engine_guess_path.write_text(engine_json_str)
+        self.outcomes_guess_path.write_text(outcomes_json_str)
         # Only write the ground truth if we're comparing against it
         if self.compare_against_ground_truth and (
             self.overwrite or not self.engine_gt_path.exists()
         ):
-            self.engine_gt_path.write_text(json.dumps(engine.to_json()))
+            self.engine_gt_path.write_text(engine_json_str)
         if self.compare_against_ground_truth and (
             self.overwrite or not self.outcomes_gt_path.exists()
         ):
-            self.outcomes_gt_path.write_text(json.dumps(asn_to_packet_outcome_dict))
+            self.outcomes_gt_path.write_text(outcomes_json_str)
 
     def _generate_diagrams(self, scenario: Scenario, dpi: int | None = None):
         """Generates the diagrams"""
@@ -130,9 +133,17 @@ class EngineRunner:
                 )
             )
 
+        # The guess and the ground truth are usually identical, so key the
+        # (expensive) engine reconstruction on the JSON str and only build once
+        engines_by_json_str: dict[str, SimulationEngine] = dict()
         for engine_path, packet_outcomes_path, diagram_path, name in vals:
+            engine_json_str = engine_path.read_text()
+            engine = engines_by_json_str.get(engine_json_str)
+            if engine is None:
+                engine = SimulationEngine.from_json(json.loads(engine_json_str))
+                engines_by_json_str[engine_json_str] = engine
             Diagram().run(
-                engine=SimulationEngine.from_json(json.loads(engine_path.read_text())),
+                engine=engine,
                 scenario=scenario,
                 packet_outcomes={
                     int(asn): Outcomes(outcome)
@@ -152,15 +163,16 @@ class EngineRunner:
             return
 
         """Compares the guesses against ground truth for engine and packet outcomes"""
-        engine_guess = SimulationEngine.from_json(
-            json.loads(self.engine_guess_path.read_text())
-        )
-        engine_gt = SimulationEngine.from_json(
-            json.loads(self.engine_gt_path.read_text())
-        )
-        assert engine_guess == engine_gt, (
-            "Engine guess does not match engine ground truth"
-        )
+        engine_guess_json_str = self.engine_guess_path.read_text()
+        engine_gt_json_str = self.engine_gt_path.read_text()
+        # Identical JSON is always an identical engine, so only rebuild both
+        # engines (which is much slower) to compare them when the JSON differs
+        if engine_guess_json_str != engine_gt_json_str:
+            engine_guess = SimulationEngine.from_json(json.loads(engine_guess_json_str))
+            engine_gt = SimulationEngine.from_json(json.loads(engine_gt_json_str))
+            assert engine_guess == engine_gt, (
+                "Engine guess does not match engine ground truth"
+            )
 
         outcomes_guess = json.loads(self.outcomes_guess_path.read_text())
         outcomes_gt = json.loads(self.outcomes_gt_path.read_text())
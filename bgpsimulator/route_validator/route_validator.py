@@ -12,6 +12,7 @@ class RouteValidator:
     def __init__(self) -> None:
         self.root: ROASNode = ROASNode()
         self.get_roa_outcome.cache_clear()
+        self.is_invalid.cache_clear()
         self._roas: list[ROA] = list()
 
     @property
@@ -61,10 +62,9 @@ class RouteValidator:
     def _get_binary_str_from_prefix(self, prefix: Prefix) -> str:
         """Returns a binary string from a prefix"""
 
-        binary_str = ""
-        for _byte in prefix.network_address.packed:
-            binary_str += str(bin(_byte))[2:].zfill(8)
-        return binary_str
+        # Straight from the network int, rather than building an IPv6Address
+        # and formatting it byte by byte
+        return format(prefix.network_int, "0128b")
 
     @lru_cache(maxsize=10_000)  # noqa: B019
     def get_roa_outcome(
@@ -91,6 +91,17 @@ class RouteValidator:
         else:
             return ROAValidity.UNKNOWN, ROARouted.UNKNOWN
 
+    @lru_cache(maxsize=10_000)  # noqa: B019
+    def is_invalid(self, prefix: Prefix, origin: int) -> bool:
+        """Returns True if the prefix-origin pair is ROA invalid
+
+        ROV checks this for every ann, and the same few prefix-origin pairs are
+        checked over and over, so the bool is cached on its own rather than
+        reinterpreting the cached ROA outcome each time
+        """
+
+        return ROAValidity.is_invalid(self.get_roa_outcome(prefix, origin)[0])
+
     def get_relevant_roas(self, prefix: Prefix) -> set[ROA]:
         """Returns all relevant ROAs for a given prefix
 
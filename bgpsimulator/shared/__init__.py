@@ -9,7 +9,16 @@ from .exceptions import (
 )
 from .enums import (
     Relationships,
+    RELATIONSHIPS_BY_VALUE,
     Settings,
+    ASPA_SETTING,
+    ASPAPP_SETTING,
+    ASPA_W_N_SETTING,
+    ASRA_SETTING,
+    BGP_I_SEC_SETTING,
+    BGP_I_SEC_TRANSITIVE_SETTING,
+    PATH_END_SETTING,
+    PROVIDER_CONE_ID_SETTING,
     ROAValidity,
     ROARouted,
     ASNGroups,
@@ -33,7 +42,16 @@ __all__ = [
     "ReservedPrefixError",
     "InvalidIPAddressError",
     "Relationships",
+    "RELATIONSHIPS_BY_VALUE",
     "Settings",
+    "ASPA_SETTING",
+    "ASPAPP_SETTING",
+    "ASPA_W_N_SETTING",
+    "ASRA_SETTING",
+    "BGP_I_SEC_SETTING",
+    "BGP_I_SEC_TRANSITIVE_SETTING",
+    "PATH_END_SETTING",
+    "PROVIDER_CONE_ID_SETTING",
     "Prefix",
     "ROAValidity",
     "ROARouted",
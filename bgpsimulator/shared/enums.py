@@ -21,6 +21,13 @@ class Relationships(IntEnum):
     UNKNOWN = 5
 
 
+# Relationships(value) is a (slow) Python level lookup, so anything that converts
+# every announcement's relationship (e.g. loading from JSON) indexes this instead
+RELATIONSHIPS_BY_VALUE: dict[int, Relationships] = {
+    rel.value: rel for rel in Relationships
+}
+
+
 class ASNGroups(StrEnum):
     """ASN groups"""
 
@@ -65,6 +72,19 @@ class Settings(IntEnum):
     ROVPP_V2_LITE = 25
 
 
+# Other ASes' settings are checked for every hop by some policy extensions
+# (e.g. ASPA), and Enum attribute lookups are slow on CPython, so those
+# extensions use these instead, which are looked up once
+ASPA_SETTING = Settings.ASPA
+ASPAPP_SETTING = Settings.ASPAPP
+ASPA_W_N_SETTING = Settings.ASPA_W_N
+ASRA_SETTING = Settings.ASRA
+BGP_I_SEC_SETTING = Settings.BGP_I_SEC
+BGP_I_SEC_TRANSITIVE_SETTING = Settings.BGP_I_SEC_TRANSITIVE
+PATH_END_SETTING = Settings.PATH_END
+PROVIDER_CONE_ID_SETTING = Settings.PROVIDER_CONE_ID
+
+
 class ROAValidity(IntEnum):
     """ROAValidity values
 
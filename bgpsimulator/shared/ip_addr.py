@@ -11,7 +11,9 @@ class IPAddr(Prefix):
 
     __slots__ = ()
 
-    def __init__(self, address: str):
-        super().__init__(address)
+    def __new__(cls, address: str) -> "IPAddr":
+        # Prefix is created (and interned) in __new__, so validate here as well
+        self = super().__new__(cls, address)
         if self.prefixlen not in {32, 128}:
             raise InvalidIPAddressError(f"Invalid IP address: {address}")
+        return self  # type: ignore
@@ -1,48 +1,167 @@
-from ipaddress import IPv6Network, ip_network
+from collections.abc import Iterator
+from functools import total_ordering
+from ipaddress import IPv6Address, IPv6Network, ip_network
+from typing import Any, ClassVar
+from weakref import WeakValueDictionary
 
 from .exceptions import ReservedPrefixError
 
+# ::ffff:0:0/96, the prefix for IPv4-mapped IPv6 addresses
+IPV4_MAPPED_PREFIX_INT = 0xFFFF << 32
 
-class Prefix(IPv6Network):
+
+def _fast_parse_ipv4(prefix: str) -> tuple[int, int] | None:
+    """Parses a plain "a.b.c.d/n" (or "a.b.c.d") str into (address int, prefixlen)
+
+    Nearly every prefix is a well formed IPv4 prefix, and ipaddress's parsing
+    is much slower. Returns None for anything else (IPv6, malformed, host bits
+    set, reserved, etc), which ipaddress then parses (or raises an error for)
+    """
+
+    addr, sep, prefixlen_str = prefix.partition("/")
+    if sep:
+        if not (
+            0 < len(prefixlen_str) < 3
+            and prefixlen_str.isascii()
+            and prefixlen_str.isdigit()
+        ):
+            return None
+        prefixlen = int(prefixlen_str)
+        if prefixlen > 32:
+            return None
+    else:
+        prefixlen = 32
+    octets = addr.split(".")
+    if len(octets) != 4:
+        return None
+    addr_int = 0
+    for octet in octets:
+        # Same as ipaddress, leading zeros are ambiguous and aren't allowed
+        if not (
+            0 < len(octet) < 4
+            and octet.isascii()
+            and octet.isdigit()
+            and (octet[0] != "0" or len(octet) == 1)
+        ):
+            return None
+        octet_int = int(octet)
+        if octet_int > 255:
+            return None
+        addr_int = addr_int << 8 | octet_int
+    # Host bits set (an error) or 240.0.0.0/4 (reserved). Let ipaddress handle it
+    if addr_int & ((1 << (32 - prefixlen)) - 1) or addr_int >= 0xF0000000:
+        return None
+    return addr_int, prefixlen
+
+
+@total_ordering
+class Prefix:
     """Prefix class that is faster than ipaddress.ip_network
 
     All prefixes (IPv4 and IPv6) are internally stored as IPv6 addresses
     using IPv4-mapped IPv6 format (::ffff:a.b.c.d) for IPv4 addresses.
+
+    Only the network address (as a 128 bit int) and the prefixlen are stored,
+    so comparisons, hashing, and subnet checks are all just int operations.
+    The ipaddress module is only used to parse the prefix
+
+    This used to subclass IPv6Network. It no longer does (so isinstance checks
+    against IPv6Network fail), but the rest of its API still works. Containment
+    is done with ints here, iterating and indexing go through the equivalent
+    IPv6Network, and so does any other attribute (netmask, hosts(), etc)
     """
 
-    __slots__ = ("_hash",)
+    __slots__ = ("network_int", "prefixlen", "_og_str_prefix", "_hash", "__weakref__")
+
+    max_prefixlen: int = 128
 
-    def __init__(self, prefix: str, *args, **kwargs):
-        """Create a fast Prefix from a string."""
+    # Every equal prefix with the same spelling is the same object, no matter how
+    # it was created (e.g. from JSON for every announcement). The spelling is part
+    # of the key since str() returns it, and otherwise str() of e.g. "1.2.3.4/32"
+    # would depend on whether "1.2.3.4" was parsed first.
+    # Weak, so unused prefixes are freed
+    _interned: ClassVar[WeakValueDictionary[tuple[type, int, int, str], "Prefix"]] = (
+        WeakValueDictionary()
+    )
+    # The same prefix strs are parsed over and over (e.g. for every announcement
+    # in a JSON), so skip parsing entirely for strs that were already seen.
+    # A plain dict bounded by _max_interned_by_str, since a WeakValueDictionary
+    # lookup (in Python) costs more than the rest of the cache hit. Anything
+    # past the bound is still interned, it's just parsed again
+    _interned_by_str: ClassVar[dict[tuple[type, str], "Prefix"]] = dict()
+    _max_interned_by_str: ClassVar[int] = 4096
+
+    def __new__(cls, prefix: str) -> "Prefix":
+        """Create a fast Prefix from a string, or return the interned one"""
 
         prefix = str(prefix)
-        self._og_str_prefix = prefix
-        temp_prefix = ip_network(prefix)
-        if temp_prefix.is_reserved:
-            raise ReservedPrefixError(
-                f"Prefix {prefix} is reserved. Reserved prefixes can't be used "
-                "since we map IPv4 prefixes to IPv6 prefixes."
-            )
-        if temp_prefix.version == 4:
-            prefix = (
-                f"::ffff:{temp_prefix.network_address}/{96 + temp_prefix.prefixlen}"
-            )
+        str_key = (cls, prefix)
+        self = Prefix._interned_by_str.get(str_key)
+        if self is not None:
+            return self
 
-        # Prefix is used as a key in dicts, so hash it in advance as it gets
-        # called millions of times. We multiply the network address by 1000 to
-        # avoid collisions with IPv6 prefix lengths (max 128)
-        self._hash: int = hash(
-            int(ip_network(prefix).network_address) * 1000 + temp_prefix.prefixlen
-        )
+        ipv4_parsed = _fast_parse_ipv4(prefix)
+        if ipv4_parsed is not None:
+            ipv4_int, og_prefixlen = ipv4_parsed
+            network_int = IPV4_MAPPED_PREFIX_INT | ipv4_int
+            prefixlen = 96 + og_prefixlen
+        else:
+            temp_prefix = ip_network(prefix)
+            if temp_prefix.is_reserved:
+                raise ReservedPrefixError(
+                    f"Prefix {prefix} is reserved. Reserved prefixes can't be used "
+                    "since we map IPv4 prefixes to IPv6 prefixes."
+                )
+            og_prefixlen = temp_prefix.prefixlen
+            if temp_prefix.version == 4:
+                network_int = IPV4_MAPPED_PREFIX_INT | int(temp_prefix.network_address)
+                prefixlen = 96 + og_prefixlen
+            else:
+                network_int = int(temp_prefix.network_address)
+                prefixlen = og_prefixlen
+
+        key = (cls, network_int, prefixlen, prefix)
+        self = Prefix._interned.get(key)
+        if self is None:
+            self = super().__new__(cls)
+            self._og_str_prefix: str = prefix
+            self.network_int: int = network_int
+            self.prefixlen: int = prefixlen
+            # Prefix is used as a key in dicts, so hash it in advance as it gets
+            # called millions of times. We multiply the network address by 1000
+            # to avoid collisions with IPv6 prefix lengths (max 128)
+            self._hash: int = hash(network_int * 1000 + og_prefixlen)
+            Prefix._interned[key] = self
+        if len(Prefix._interned_by_str) < Prefix._max_interned_by_str:
+            Prefix._interned_by_str[str_key] = self
+        return self
 
-        super().__init__(prefix, *args, **kwargs)
+    def __reduce__(self) -> tuple[type, tuple[str]]:
+        # Recreate through __new__, so that unpickled prefixes are interned too
+        return self.__class__, (self._og_str_prefix,)
 
     def __hash__(self) -> int:
         return self._hash
 
     def __eq__(self, other) -> bool:
+        # Equal prefixes are interned (per spelling), so they're nearly always
+        # the same object
+        if self is other:
+            return True
+        elif isinstance(other, Prefix):
+            return (
+                self.network_int == other.network_int
+                and self.prefixlen == other.prefixlen
+            )
+        else:
+            return NotImplemented
+
+    def __lt__(self, other: "Prefix") -> bool:
         if isinstance(other, Prefix):
-            return self._hash == other._hash
+            return (self.network_int, self.prefixlen) < (
+                other.network_int,
+                other.prefixlen,
+            )
         else:
             return NotImplemented
 
@@ -51,3 +170,88 @@ class Prefix(IPv6Network):
 
     def __repr__(self) -> str:
         return self._og_str_prefix
+
+    @property
+    def network_address(self) -> IPv6Address:
+        """The network address, as an IPv6 (or IPv4-mapped IPv6) address"""
+
+        return IPv6Address(self.network_int)
+
+    @property
+    def num_addresses(self) -> int:
+        """Number of addresses within the prefix"""
+
+        return 1 << (self.max_prefixlen - self.prefixlen)
+
+    def overlaps(self, other: "Prefix") -> bool:
+        """Returns True if either prefix contains the other"""
+
+        return self.subnet_of(other) or self.supernet_of(other)
+
+    def __contains__(self, other: "Prefix | IPv6Address") -> bool:
+        """Returns True if the address (or prefix, e.g. an IPAddr) is in this prefix
+
+        IPv4 addresses must be IPAddrs (or IPv4-mapped IPv6Addresses), same as
+        when this subclassed IPv6Network
+        """
+
+        host_bits = self.max_prefixlen - self.prefixlen
+        if isinstance(other, Prefix):
+            return (
+                other.prefixlen >= self.prefixlen
+                and other.network_int >> host_bits == self.network_int >> host_bits
+            )
+        elif isinstance(other, IPv6Address):
+            return int(other) >> host_bits == self.network_int >> host_bits
+        else:
+            return False
+
+    def __iter__(self) -> Iterator[IPv6Address]:
+        """Iterates over every address in the prefix (see IPv6Network)"""
+
+        return iter(self.ipv6_network)
+
+    def __getitem__(self, n: int) -> IPv6Address:
+        """Returns the nth address in the prefix (see IPv6Network)"""
+
+        return self.ipv6_network[n]
+
+    def subnet_of(self, other: "Prefix") -> bool:
+        """Returns True if this prefix is within (or equal to) the other prefix"""
+
+        host_bits = self.max_prefixlen - other.prefixlen
+        return (
+            self.prefixlen >= other.prefixlen
+            and self.network_int >> host_bits == other.network_int >> host_bits
+        )
+
+    def supernet_of(self, other: "Prefix") -> bool:
+        """Returns True if this prefix contains (or is equal to) the other prefix"""
+
+        host_bits = self.max_prefixlen - self.prefixlen
+        return (
+            other.prefixlen >= self.prefixlen
+            and other.network_int >> host_bits == self.network_int >> host_bits
+        )
+
+    @property
+    def ipv6_network(self) -> IPv6Network:
+        """The equivalent (IPv4-mapped for IPv4) IPv6Network"""
+
+        return IPv6Network((self.network_int, self.prefixlen))
+
+    def __getattr__(self, name: str) -> Any:
+        """Falls back to the IPv6Network for any attribute that Prefix lacks
+
+        For backwards compatibility, from when Prefix subclassed IPv6Network.
+        Only called when the normal lookup fails, so it doesn't slow anything down
+        """
+
+        # Private attrs and dunders (e.g. from copy and pickle) never fall back.
+        # Dunders are looked up on the type anyways, which is why the ones that
+        # IPv6Network supports (e.g. __contains__) are defined above
+        if name.startswith("_"):
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        return getattr(self.ipv6_network, name)
@@ -1,6 +1,6 @@
 from typing import Any
 
-from bgpsimulator.shared import Prefix, Relationships
+from bgpsimulator.shared import RELATIONSHIPS_BY_VALUE, Prefix, Relationships
 
 
 class Announcement:
@@ -36,7 +36,8 @@ class Announcement:
     ):
         self.prefix: Prefix = prefix
         self.as_path: tuple[int, ...] = as_path
-        # Equivalent to the next hop in a normal BGP announcement
+        # Equivalent to the next hop in a normal BGP announcement. Defaults to the
+        # first ASN in the path (i.e. the AS that sent it), so it's never None
         self.next_hop_asn: int = next_hop_asn or as_path[0]
         self.recv_relationship: Relationships = recv_relationship
         self.timestamp: int = timestamp
@@ -46,22 +47,6 @@ class Announcement:
         self.rovpp_blackhole: bool = rovpp_blackhole
         self.rost_ids: tuple[int, ...] = rost_ids or ()
         self.withdraw: bool = withdraw
-        if self.next_hop_asn is None:
-            # next hop defaults to None, messing up the type
-            if len(self.as_path) == 1:  # type: ignore
-                self.next_hop_asn = self.as_path[0]
-            elif len(self.as_path) > 1:
-                raise ValueError(
-                    "Announcement was initialized with an AS path longer than 1 "
-                    f"({self.as_path}) but the next_hop_asn is ambiguous. "
-                    " next_hop_asn is where the traffic should route to next."
-                    "Please add "
-                    "the next_hop_asn to the initialization parameters "
-                    f"for the announcement of prefix {self.prefix}"
-                )
-            else:
-                # Path is either zero or some other case we didn't account for
-                raise NotImplementedError
 
     def copy(
         self,
@@ -77,33 +62,39 @@ class Announcement:
         rost_ids: tuple[int, ...] | None = None,
         withdraw: bool | None = None,
     ) -> "Announcement":
-        """Creates a new announcement with the same attributes"""
-        return Announcement(
-            # NOTE: CANT USE OR!!! some of the actual vals are falsey
-            prefix=prefix if prefix is not None else self.prefix,
-            as_path=as_path if as_path is not None else self.as_path,
-            next_hop_asn=next_hop_asn
-            if next_hop_asn is not None
-            else self.next_hop_asn,
-            recv_relationship=recv_relationship
-            if recv_relationship is not None
-            else self.recv_relationship,
-            timestamp=timestamp if timestamp is not None else self.timestamp,
-            bgpsec_next_asn=bgpsec_next_asn
-            if bgpsec_next_asn is not None
-            else self.bgpsec_next_asn,
-            bgpsec_as_path=bgpsec_as_path
-            if bgpsec_as_path is not None
-            else self.bgpsec_as_path,
-            only_to_customers=only_to_customers
-            if only_to_customers is not None
-            else self.only_to_customers,
-            rovpp_blackhole=rovpp_blackhole
-            if rovpp_blackhole is not None
-            else self.rovpp_blackhole,
-            rost_ids=rost_ids if rost_ids is not None else self.rost_ids,
-            withdraw=withdraw if withdraw is not None else self.withdraw,
+        """Creates a new announcement with the same attributes
+
+        This is called for nearly every announcement that gets propagated, so
+        rather than going through __init__ (which would only redo the next hop
+        checks for attrs that were already validated), the slots are set directly
+        """
+
+        # NOTE: CANT USE OR!!! some of the actual vals are falsey
+        new_ann = object.__new__(Announcement)
+        new_ann.prefix = self.prefix if prefix is None else prefix
+        new_ann.as_path = self.as_path if as_path is None else as_path
+        new_ann.next_hop_asn = (
+            self.next_hop_asn if next_hop_asn is None else next_hop_asn
+        )
+        new_ann.recv_relationship = (
+            self.recv_relationship if recv_relationship is None else recv_relationship
+        )
+        new_ann.timestamp = self.timestamp if timestamp is None else timestamp
+        new_ann.bgpsec_next_asn = (
+            self.bgpsec_next_asn if bgpsec_next_asn is None else bgpsec_next_asn
         )
+        new_ann.bgpsec_as_path = (
+            self.bgpsec_as_path if bgpsec_as_path is None else bgpsec_as_path
+        )
+        new_ann.only_to_customers = (
+            self.only_to_customers if only_to_customers is None else only_to_customers
+        )
+        new_ann.rovpp_blackhole = (
+            self.rovpp_blackhole if rovpp_blackhole is None else rovpp_blackhole
+        )
+        new_ann.rost_ids = self.rost_ids if rost_ids is None else rost_ids
+        new_ann.withdraw = self.withdraw if withdraw is None else withdraw
+        return new_ann
 
     def __repr__(self) -> str:
         return f"{self.prefix} {self.as_path} {self.recv_relationship.name}"
@@ -141,18 +132,21 @@ class Announcement:
         return self.as_path[-1]
 
     def to_json(self) -> dict[str, Any]:
-        """Converts the announcement to a JSON object"""
+        """Converts the announcement to a JSON object
+
+        Tuples are left as is, since the json module encodes them as arrays
+        """
         return {
             "prefix": str(self.prefix),
-            "as_path": list(self.as_path),
+            "as_path": self.as_path,
             "next_hop_asn": self.next_hop_asn,
             "recv_relationship": self.recv_relationship,
             "timestamp": self.timestamp,
             "bgpsec_next_asn": self.bgpsec_next_asn,
-            "bgpsec_as_path": list(self.bgpsec_as_path),
+            "bgpsec_as_path": self.bgpsec_as_path,
             "only_to_customers": self.only_to_customers,
             "rovpp_blackhole": self.rovpp_blackhole,
-            "rost_ids": list(self.rost_ids),
+            "rost_ids": self.rost_ids,
             "withdraw": self.withdraw,
         }
 
@@ -163,7 +157,7 @@ class Announcement:
             prefix=Prefix(json_obj["prefix"]),
             as_path=tuple(json_obj["as_path"]),
             next_hop_asn=json_obj.get("next_hop_asn", json_obj["as_path"][0]),
-            recv_relationship=Relationships(json_obj["recv_relationship"]),
+            recv_relationship=RELATIONSHIPS_BY_VALUE[json_obj["recv_relationship"]],
             timestamp=json_obj.get("timestamp", 0),
             bgpsec_next_asn=json_obj.get("bgpsec_next_asn"),
             bgpsec_as_path=tuple(json_obj.get("bgpsec_as_path", [])),
@@ -1,19 +1,20 @@
-import dataclasses
-from collections import UserDict
-from typing import Any
+from collections.abc import Iterable, Mapping
+from typing import Any, NamedTuple
 
-from bgpsimulator.shared import Prefix, Relationships
+from bgpsimulator.shared import RELATIONSHIPS_BY_VALUE, Prefix, Relationships
 from bgpsimulator.simulation_engine import Announcement as Ann
 
 
-@dataclasses.dataclass(frozen=True, slots=True)
-class AnnInfo:
-    """Dataclass for storing a ribs in Ann info
+class AnnInfo(NamedTuple):
+    """NamedTuple for storing a ribs in Ann info
 
     These announcements are unprocessed, so we store
     the unprocessed_ann and also the recv_relationship
     (since the recv_relationship on the announcement is
     from the last AS and has not yet been updated)
+
+    A NamedTuple rather than a frozen dataclass, since one is created for every
+    ann added to the AdjRIBsIn, and tuples are much cheaper to create
     """
 
     unprocessed_ann: "Ann"
@@ -33,22 +34,121 @@ class AnnInfo:
 
         return cls(
             unprocessed_ann=Ann.from_json(json["unprocessed_ann"]),
-            recv_relationship=Relationships(json["recv_relationship"]),
+            recv_relationship=RELATIONSHIPS_BY_VALUE[json["recv_relationship"]],
         )
 
 
-class AdjRIBsIn(UserDict[int, dict[Prefix, AnnInfo]]):
+class AdjRIBsIn(dict[int, dict[Prefix, AnnInfo]]):
     """Incomming announcements for a BGP AS
 
     neighbor_asn: {prefix: (unprocessed_ann, relationship)}
+
+    The same AnnInfos are also indexed by prefix: {prefix: {neighbor_asn: AnnInfo}}
+    so that get_ann_infos doesn't have to check every neighbor
+
+    A dict subclass rather than a UserDict, since every UserDict lookup goes
+    through a Python level method. The dict methods that add or remove neighbors
+    are overridden to keep the index in sync. The inner {prefix: AnnInfo} dicts
+    must only be changed through add_unprocessed_ann and remove_entry
     """
 
+    __slots__ = ("_ann_infos_by_prefix",)
+
+    def __init__(self, *args, **kwargs) -> None:
+        self._ann_infos_by_prefix: dict[Prefix, dict[int, AnnInfo]] = dict()
+        # dict.__init__ doesn't call the overridden update
+        super().__init__(*args, **kwargs)
+        for neighbor_asn, prefix_ann_info in self.items():
+            self._index_neighbor(neighbor_asn, prefix_ann_info)
+
+    def _index_neighbor(
+        self, neighbor_asn: int, prefix_ann_info: dict[Prefix, AnnInfo]
+    ) -> None:
+        """Adds a neighbor's AnnInfos to the prefix index"""
+
+        for prefix, ann_info in prefix_ann_info.items():
+            self._ann_infos_by_prefix.setdefault(prefix, dict())[neighbor_asn] = (
+                ann_info
+            )
+
+    def _unindex_neighbor(self, neighbor_asn: int) -> None:
+        """Removes a neighbor's AnnInfos from the prefix index"""
+
+        for prefix in self.get(neighbor_asn, ()):
+            del self._ann_infos_by_prefix[prefix][neighbor_asn]
+
+    ######################################################
+    # dict methods, overridden to keep the index in sync #
+    ######################################################
+
+    def __setitem__(
+        self, neighbor_asn: int, prefix_ann_info: dict[Prefix, AnnInfo]
+    ) -> None:
+        """Replaces all of a neighbor's AnnInfos"""
+
+        self._unindex_neighbor(neighbor_asn)
+        super().__setitem__(neighbor_asn, prefix_ann_info)
+        self._index_neighbor(neighbor_asn, prefix_ann_info)
+
+    def __delitem__(self, neighbor_asn: int) -> None:
+        """Removes all of a neighbor's AnnInfos"""
+
+        self._unindex_neighbor(neighbor_asn)
+        super().__delitem__(neighbor_asn)
+
+    def __ior__(self, other: Any) -> "AdjRIBsIn":  # type: ignore
+        """Same as update"""
+
+        self.update(other)
+        return self
+
+    def pop(self, neighbor_asn: int, *default: Any) -> Any:
+        """Removes and returns all of a neighbor's AnnInfos"""
+
+        self._unindex_neighbor(neighbor_asn)
+        return super().pop(neighbor_asn, *default)
+
+    def popitem(self) -> tuple[int, dict[Prefix, AnnInfo]]:
+        """Removes and returns the last neighbor's AnnInfos"""
+
+        neighbor_asn, prefix_ann_info = super().popitem()
+        for prefix in prefix_ann_info:
+            del self._ann_infos_by_prefix[prefix][neighbor_asn]
+        return neighbor_asn, prefix_ann_info
+
+    def setdefault(
+        self, neighbor_asn: int, default: dict[Prefix, AnnInfo] | None = None
+    ) -> dict[Prefix, AnnInfo]:
+        """Returns a neighbor's AnnInfos, adding default if there are none"""
+
+        if neighbor_asn not in self:
+            self[neighbor_asn] = dict() if default is None else default
+        return super().__getitem__(neighbor_asn)
+
+    def update(self, other: Any = (), /) -> None:  # type: ignore
+        """Replaces the AnnInfos of every neighbor in other"""
+
+        items: Iterable[tuple[int, dict[Prefix, AnnInfo]]] = (
+            other.items() if isinstance(other, Mapping) else other
+        )
+        for neighbor_asn, prefix_ann_info in items:
+            self[neighbor_asn] = prefix_ann_info
+
+    def __reduce__(self) -> tuple[type, tuple[dict[int, dict[Prefix, AnnInfo]]]]:
+        """Pickles as the plain dict, and rebuilds the index when unpickled
+
+        Otherwise pickle would restore the items through __setitem__
+        before the index exists
+        """
+
+        return (self.__class__, (dict(self),))
+
     def get_unprocessed_ann_recv_rel(
         self, neighbor_asn: int, prefix: Prefix
     ) -> AnnInfo | None:
         """Returns AnnInfo for a neighbor ASN and prefix"""
 
-        return self.data.get(neighbor_asn, dict()).get(prefix)
+        return self.get(neighbor_asn, dict()).get(prefix)
 
     def add_unprocessed_ann(
         self,
@@ -59,26 +159,29 @@ class AdjRIBsIn(UserDict[int, dict[Prefix, AnnInfo]]):
 
         # Shorten the var name
         ann = unprocessed_ann
-        if ann.as_path[0] not in self.data:
-            self.data[ann.as_path[0]] = {
-                ann.prefix: AnnInfo(
-                    unprocessed_ann=unprocessed_ann, recv_relationship=recv_relationship
-                )
-            }
+        neighbor_asn = ann.as_path[0]
+        ann_info = AnnInfo(unprocessed_ann, recv_relationship)
+        # The index is updated below, so skip the overridden __setitem__
+        if neighbor_asn not in self:
+            dict.__setitem__(self, neighbor_asn, {ann.prefix: ann_info})
         else:
-            self.data[ann.as_path[0]][ann.prefix] = AnnInfo(
-                unprocessed_ann=unprocessed_ann, recv_relationship=recv_relationship
-            )
+            self[neighbor_asn][ann.prefix] = ann_info
+        self._ann_infos_by_prefix.setdefault(ann.prefix, dict())[neighbor_asn] = (
+            ann_info
+        )
 
     def get_ann_infos(self, prefix: Prefix) -> list[AnnInfo]:
-        """Returns AnnInfos for a given prefix"""
+        """Returns AnnInfos for a given prefix
 
-        ann_infos = []
-        for prefix_ann_info in self.data.values():
-            ann_info = prefix_ann_info.get(prefix)
-            if ann_info:
-                ann_infos.append(ann_info)
-        return ann_infos
+        These are in the order the neighbors sent the prefix (so a neighbor that
+        withdraws and re-announces moves to the end), not in neighbor order.
+        Best path selection doesn't depend on this order, since its last
+        tiebreaker is the lowest neighbor ASN, and there is at most one AnnInfo
+        per neighbor
+        """
+
+        ann_infos_by_neighbor = self._ann_infos_by_prefix.get(prefix)
+        return list(ann_infos_by_neighbor.values()) if ann_infos_by_neighbor else []
 
     def remove_entry(self, neighbor_asn: int, prefix: Prefix):
         """Removes AnnInfo from RibsIn
@@ -88,15 +191,23 @@ class AdjRIBsIn(UserDict[int, dict[Prefix, AnnInfo]]):
         """
 
         try:
-            del self.data[neighbor_asn][prefix]
+            del self[neighbor_asn][prefix]
         except KeyError:
             pass
+        else:
+            del self._ann_infos_by_prefix[prefix][neighbor_asn]
+
+    def clear(self) -> None:
+        """Removes all AnnInfos (and the prefix index along with them)"""
+
+        super().clear()
+        self._ann_infos_by_prefix.clear()
 
     def to_json(self) -> dict[int, dict[str, dict[str, Ann | Relationships]]]:
         """Returns a JSON representation of the AdjRIBsIn"""
 
         json_obj = {}
-        for neighbor_asn, prefix_ann_info in self.data.items():
+        for neighbor_asn, prefix_ann_info in self.items():
             json_obj[neighbor_asn] = {
                 str(prefix): ann_info.to_json()
                 for prefix, ann_info in prefix_ann_info.items()
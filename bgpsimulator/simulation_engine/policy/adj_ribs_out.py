@@ -1,33 +1,35 @@
-from collections import UserDict
-
 from bgpsimulator.shared import Prefix
 from bgpsimulator.simulation_engine import Announcement as Ann
 
 
-class AdjRIBsOut(UserDict[int, dict[Prefix, Ann]]):
+class AdjRIBsOut(dict[int, dict[Prefix, Ann]]):
     """Incomming announcements for a BGP AS
 
     neighbor: {prefix: announcement}
+
+    A dict subclass rather than a UserDict (same as the AdjRIBsIn)
     """
 
+    __slots__ = ()
+
     def get_ann(self, neighbor_asn: int, prefix: Prefix) -> Ann | None:
         """Returns Ann for a given neighbor asn and prefix"""
 
-        return self.data.get(neighbor_asn, dict()).get(prefix)
+        return self.get(neighbor_asn, dict()).get(prefix)
 
     def add_ann(self, neighbor_asn: int, ann: Ann) -> None:
         """Adds announcement to the ribs out"""
 
-        if neighbor_asn in self.data:
-            self.data[neighbor_asn][ann.prefix] = ann
+        if neighbor_asn in self:
+            self[neighbor_asn][ann.prefix] = ann
         else:
-            self.data[neighbor_asn] = {ann.prefix: ann}
+            self[neighbor_asn] = {ann.prefix: ann}
 
     def remove_entry(self, neighbor_asn: int, prefix: Prefix) -> bool:
         """Removes ann from ribs out"""
 
         try:
-            del self.data[neighbor_asn][prefix]
+            del self[neighbor_asn][prefix]
             return True
         except KeyError:
             return False
@@ -35,7 +37,7 @@ class AdjRIBsOut(UserDict[int, dict[Prefix, Ann]]):
     def populated_neighbors(self) -> list[int]:
         """Return all neighbors from the ribs out"""
 
-        return list(self.data.keys())
+        return list(self.keys())
 
     def to_json(self) -> dict[int, dict[str, dict[str, dict[str, Ann]]]]:
         """Returns a JSON representation of the AdjRIBsOut"""
@@ -44,7 +46,7 @@ class AdjRIBsOut(UserDict[int, dict[Prefix, Ann]]):
             neighbor_asn: {
                 str(prefix): ann.to_json() for prefix, ann in prefix_anns.items()
             }
-            for neighbor_asn, prefix_anns in self.data.items()
+            for neighbor_asn, prefix_anns in self.items()
         }
 
     @classmethod
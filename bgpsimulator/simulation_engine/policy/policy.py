@@ -1,10 +1,8 @@
-from collections import defaultdict
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, cast
 from weakref import proxy
 
 from bgpsimulator.route_validator import RouteValidator
-from bgpsimulator.shared import IPAddr, Prefix, Relationships, ROAValidity, Settings
-from bgpsimulator.shared.exceptions import GaoRexfordError
+from bgpsimulator.shared import IPAddr, Prefix, Relationships, Settings
 from bgpsimulator.simulation_engine.announcement import Announcement as Ann
 
 from .policy_extensions import (
@@ -47,12 +45,30 @@ class Policy:
         "recv_q",
         "settings",
         "as_",
+        "asn",
         "adj_ribs_in",
         "adj_ribs_out",
+        "_pipelines_settings",
+        "_valid_ann_funcs",
+        "_policy_propagate_funcs",
+        "_process_ann_funcs",
+        "_bgp_full",
+        "_never_withdraw",
+        "_rost",
+        "_rovpp_lite",
     )
 
     route_validator = RouteValidator()
     rost_trusted_repository = RoSTTrustedRepository()
+    # Shared by every policy that uses the defaults. Iterating over the enum
+    # for each of the tens of thousands of policies is slow, and since tuples
+    # are immutable, sharing is safe (settings are replaced, not mutated)
+    default_settings: tuple[bool, ...] = tuple(False for _ in Settings)
+    # The (valid_ann, policy_propagate, process_ann) funcs that each settings
+    # tuple uses, since nearly every policy shares one of just a few settings
+    _pipelines_by_settings: ClassVar[
+        dict[tuple[bool, ...], tuple[tuple[Callable, ...], ...]]
+    ] = dict()
 
     def __init__(
         self,
@@ -71,24 +87,61 @@ class Policy:
         """
 
         self.local_rib: dict[Prefix, Ann] = local_rib or dict()
-        self.recv_q: defaultdict[Prefix, list[Ann]] = defaultdict(list)
+        # A plain dict rather than a defaultdict, since CPython only specializes
+        # lookups on exact dicts (see receive_ann)
+        self.recv_q: dict[Prefix, list[Ann]] = dict()
         self.adj_ribs_in: AdjRIBsIn = adj_ribs_in or AdjRIBsIn()
         self.adj_ribs_out: AdjRIBsOut = adj_ribs_out or AdjRIBsOut()
         self.rost_trusted_repository.clear()
         if settings:
             self.settings: tuple[bool, ...] = settings
         else:
-            self.settings = tuple([False for _ in Settings])
+            self.settings = self.default_settings
+        # Sets the pipelines and flags used by the settings (see _set_pipelines)
+        self._set_pipelines()
         # The AS object that this routing policy is associated with
         # Casting this so we don't ened to put callable proxy type everywhere
         self.as_: AS = cast("AS", proxy(as_))
+        # The AS's ASN, which is read for nearly every ann. A slot read is several
+        # times faster than going through the as_ proxy, and ASNs never change
+        self.asn: int = as_.asn
 
     def __eq__(self, other) -> bool:
+        """Compares the same state as to_json, without building JSON"""
+
         if isinstance(other, Policy):
-            return self.to_json() == other.to_json()
+            return (
+                self.settings == other.settings
+                and self.local_rib == other.local_rib
+                and self.adj_ribs_in == other.adj_ribs_in
+                and self.adj_ribs_out == other.adj_ribs_out
+            )
         else:
             return NotImplemented
 
+    # Attrs that are pickled (in order). The AS is a weakref proxy which can't
+    # be pickled, so it is dropped and restored by the AS when it's unpickled.
+    # The pipelines are rebuilt from the settings, so they aren't pickled either
+    _pickled_attrs: tuple[str, ...] = tuple(
+        attr for attr in __slots__ if attr != "as_" and not attr.startswith("_")
+    )
+
+    def __getstate__(self) -> tuple[Any, ...]:
+        """Returns the policy state for pickling, as a tuple in _pickled_attrs order
+
+        A tuple rather than a dict so that the attr names aren't repeated for
+        each of the tens of thousands of policies
+        """
+
+        return tuple([getattr(self, attr) for attr in self._pickled_attrs])
+
+    def __setstate__(self, state: tuple[Any, ...]) -> None:
+        """Restores the policy from a pickle (as_ is set by the AS)"""
+
+        for attr, value in zip(self._pickled_attrs, state, strict=True):
+            setattr(self, attr, value)
+        self._set_pipelines()
+
     def clear(self) -> None:
         """Clears the routing policy"""
 
@@ -97,6 +150,140 @@ class Policy:
         self.adj_ribs_in.clear()
         self.adj_ribs_out.clear()
 
+    def _set_pipelines(self) -> None:
+        """Sets the funcs and flags used by the settings
+
+        The settings are fixed for an entire propagation, so rather than checking
+        each setting for every ann, this is done once. Settings are replaced (never
+        mutated), so this is redone whenever self.settings is a different tuple.
+        valid_ann, process_incoming_anns, _propagate, and policy_propagate check
+        for that, and everything that they call can use these directly
+
+        Looking up a Settings member (e.g. Settings.BGP_FULL) is slow on CPython
+        3.11 (~140ns), which adds up when done for every ann sent or received
+        """
+
+        settings = self.settings
+        pipelines = Policy._pipelines_by_settings.get(settings)
+        if pipelines is None:
+            pipelines = (
+                self._get_valid_ann_funcs(settings),
+                self._get_policy_propagate_funcs(settings),
+                self._get_process_ann_funcs(settings),
+            )
+            Policy._pipelines_by_settings[settings] = pipelines
+        (
+            self._valid_ann_funcs,
+            self._policy_propagate_funcs,
+            self._process_ann_funcs,
+        ) = pipelines
+        self._bgp_full: bool = settings[Settings.BGP_FULL]
+        self._never_withdraw: bool = settings[Settings.NEVER_WITHDRAW]
+        self._rost: bool = settings[Settings.ROST]
+        self._rovpp_lite: bool = (
+            settings[Settings.ROVPP_V1_LITE]
+            or settings[Settings.ROVPP_V2_LITE]
+            or settings[Settings.ROVPP_V2I_LITE]
+        )
+        self._pipelines_settings: tuple[bool, ...] = settings
+
+    @staticmethod
+    def _get_valid_ann_funcs(settings: tuple[bool, ...]) -> tuple[Callable, ...]:
+        """Returns the valid_ann funcs for the settings, in the order they're run"""
+
+        valid_ann_funcs: list[Callable] = [BGP.valid_ann]
+        # ASPAwN and ASRA are supersets of ASPA
+        if (
+            settings[Settings.ASPA]
+            and not settings[Settings.ASRA]
+            and not settings[Settings.ASPA_W_N]
+        ):
+            valid_ann_funcs.append(ASPA.valid_ann)
+        if settings[Settings.ASPA_W_N] and not settings[Settings.ASRA]:
+            valid_ann_funcs.append(ASPAwN.valid_ann)
+        if settings[Settings.ASRA]:
+            valid_ann_funcs.append(ASRA.valid_ann)
+        if settings[Settings.AS_PATH_EDGE_FILTER]:
+            valid_ann_funcs.append(ASPathEdgeFilter.valid_ann)
+        if settings[Settings.ENFORCE_FIRST_AS]:
+            valid_ann_funcs.append(EnforceFirstAS.valid_ann)
+        if settings[Settings.ONLY_TO_CUSTOMERS]:
+            valid_ann_funcs.append(OnlyToCustomers.valid_ann)
+        # All use ROV for validity
+        if (
+            settings[Settings.ROV]
+            or settings[Settings.ROVPP_V1_LITE]
+            or settings[Settings.ROVPP_V2_LITE]
+            or settings[Settings.ROVPP_V2I_LITE]
+        ):
+            valid_ann_funcs.append(ROV.valid_ann)
+        if settings[Settings.PEER_ROV]:
+            valid_ann_funcs.append(PeerROV.valid_ann)
+        if settings[Settings.PATH_END]:
+            valid_ann_funcs.append(PathEnd.valid_ann)
+        if settings[Settings.PEERLOCK_LITE]:
+            valid_ann_funcs.append(PeerLockLite.valid_ann)
+        if settings[Settings.BGP_I_SEC] or settings[Settings.BGP_I_SEC_TRANSITIVE]:
+            valid_ann_funcs.append(BGPiSecTransitive.valid_ann)
+        if settings[Settings.PROVIDER_CONE_ID]:
+            valid_ann_funcs.append(ProviderConeID.valid_ann)
+        if settings[Settings.ASPAPP]:
+            valid_ann_funcs.append(ASPAPP.valid_ann)
+        return tuple(valid_ann_funcs)
+
+    @staticmethod
+    def _get_policy_propagate_funcs(
+        settings: tuple[bool, ...],
+    ) -> tuple[Callable, ...]:
+        """Returns the get_policy_propagate_vals funcs for the settings, in order"""
+
+        policy_propagate_funcs: list[Callable] = []
+        if settings[Settings.BGP_I_SEC] or settings[Settings.BGP_I_SEC_TRANSITIVE]:
+            policy_propagate_funcs.append(BGPiSecTransitive.get_policy_propagate_vals)
+        # NOTE: THIS MUST BE ELIF!! BGPiSecTransitive is a superset of BGPSec and has
+        # different get_policy_propagate_vals
+        elif settings[Settings.BGPSEC]:
+            policy_propagate_funcs.append(BGPSec.get_policy_propagate_vals)
+        if settings[Settings.ONLY_TO_CUSTOMERS]:
+            policy_propagate_funcs.append(OnlyToCustomers.get_policy_propagate_vals)
+        if settings[Settings.ROVPP_V2I_LITE]:
+            policy_propagate_funcs.append(ROVPPV2iLite.get_policy_propagate_vals)
+        # If V2i is deployed, don't use V2
+        elif settings[Settings.ROVPP_V2_LITE]:
+            policy_propagate_funcs.append(ROVPPV2Lite.get_policy_propagate_vals)
+        # If v2i or v2 are set, don't use v1 (since they are supersets)
+        elif settings[Settings.ROVPP_V1_LITE]:
+            policy_propagate_funcs.append(ROVPPV1Lite.get_policy_propagate_vals)
+        if settings[Settings.ORIGIN_PREFIX_HIJACK_CUSTOMERS]:
+            policy_propagate_funcs.append(
+                OriginPrefixHijackCustomers.get_policy_propagate_vals
+            )
+        if settings[Settings.FIRST_ASN_STRIPPING_PREFIX_HIJACK_CUSTOMERS]:
+            policy_propagate_funcs.append(
+                FirstASNStrippingPrefixHijackCustomers.get_policy_propagate_vals
+            )
+        if settings[Settings.NEVER_PROPAGATE_WITHDRAWALS]:
+            policy_propagate_funcs.append(
+                NeverPropagateWithdrawals.get_policy_propagate_vals
+            )
+        return tuple(policy_propagate_funcs)
+
+    @staticmethod
+    def _get_process_ann_funcs(settings: tuple[bool, ...]) -> tuple[Callable, ...]:
+        """Returns the extension process_ann funcs for the settings, in order
+
+        These run after the AS is prepended and the recv_relationship is set
+        """
+
+        process_ann_funcs: list[Callable] = []
+        if settings[Settings.BGP_I_SEC] or settings[Settings.BGP_I_SEC_TRANSITIVE]:
+            process_ann_funcs.append(BGPiSecTransitive.process_ann)
+        elif settings[Settings.BGPSEC]:
+            process_ann_funcs.append(BGPSec.process_ann)
+        if settings[Settings.ROST]:
+            process_ann_funcs.append(ROST.process_ann)
+        return tuple(process_ann_funcs)
+
     #########################
     # Process Incoming Anns #
     #########################
@@ -121,7 +308,11 @@ class Policy:
     def receive_ann(self, ann: Ann) -> None:
         """Receives an announcement from a neighbor"""
 
-        self.recv_q[ann.prefix].append(ann)
+        recv_q_anns = self.recv_q.get(ann.prefix)
+        if recv_q_anns is None:
+            self.recv_q[ann.prefix] = [ann]
+        else:
+            recv_q_anns.append(ann)
 
     def process_incoming_anns(
         self,
@@ -132,7 +323,15 @@ class Policy:
     ) -> None:
         """Process all announcements that were incoming from a specific rel"""
 
-        if self.settings[Settings.ROST]:
+        if self._pipelines_settings is not self.settings:
+            self._set_pipelines()
+
+        # Most ASes receive nothing from most relationships. RoST and ROV++ still
+        # run without any received anns (they add withdrawals and blackholes)
+        if not self.recv_q and not self._rost and not self._rovpp_lite:
+            return
+
+        if self._rost:
             ROST.preprocess_incoming_anns(
                 self, from_rel=from_rel, propagation_round=propagation_round
             )
@@ -146,15 +345,15 @@ class Policy:
             # For each announcement that was incoming
             for new_ann in ann_list:
                 # Ignore all withdrawals
-                if self.settings[Settings.NEVER_WITHDRAW] and new_ann.withdraw:
+                if self._never_withdraw and new_ann.withdraw:
                     continue
 
-                if self.settings[Settings.BGP_FULL]:
+                if self._bgp_full:
                     # If withdrawal remove from AdjRIBsIn, otherwise add to AdjRIBsIn
                     self._process_new_ann_in_adj_ribs_in(new_ann, prefix, from_rel)
 
                 # Process withdrawals even for invalid anns in the adj_ribs_in
-                if new_ann.withdraw and self.settings[Settings.BGP_FULL]:
+                if new_ann.withdraw and self._bgp_full:
                     current_ann = self._remove_from_local_rib_and_get_new_best_ann(
                         new_ann, current_ann
                     )
@@ -167,24 +366,20 @@ class Policy:
                 if current_ann:
                     # Save to local rib
                     self.local_rib[current_ann.prefix] = current_ann
-                if og_ann and self.settings[Settings.BGP_FULL]:
+                if og_ann and self._bgp_full:
                     self.withdraw_ann_from_neighbors(
                         og_ann.copy(
-                            next_hop_asn=self.as_.asn,
+                            next_hop_asn=self.asn,
                             withdraw=True,
                         )
                     )
 
         # NOTE: all three of these have the same process_incoming_anns
         # which just adds ROV++ blackholes to the local RIB
-        if (
-            self.settings[Settings.ROVPP_V1_LITE]
-            or self.settings[Settings.ROVPP_V2_LITE]
-            or self.settings[Settings.ROVPP_V2I_LITE]
-        ):
+        if self._rovpp_lite:
             ROVPPV1Lite.process_incoming_anns(self, from_rel, propagation_round)
 
-        if self.settings[Settings.ROST]:
+        if self._rost:
             ROST.postprocess_incoming_anns(self)
 
         self.recv_q.clear()
@@ -195,6 +390,23 @@ class Policy:
         """Checks new_ann's validity, processes it, returns best_ann_by_gao_rexford."""
 
         if self.valid_ann(new_ann, from_rel):
+            # Most anns lose to the current ann, so check that before process_ann
+            # copies them. Processing prepends this AS and sets from_rel, so the
+            # processed ann's path is one longer and its neighbor is as_path[0].
+            # Skipped for settings whose process_ann does more (BGPSec, which
+            # also has its own tiebreaker, BGPiSec, and RoST)
+            if current_ann is not None and not self._process_ann_funcs:
+                if current_ann.recv_relationship > from_rel:
+                    return current_ann
+                elif current_ann.recv_relationship == from_rel:
+                    current_path_len = len(current_ann.as_path)
+                    new_path_len = len(new_ann.as_path) + 1
+                    if current_path_len < new_path_len or (
+                        current_path_len == new_path_len
+                        and current_ann.as_path[min(current_path_len, 1)]
+                        <= new_ann.as_path[0]
+                    ):
+                        return current_ann
             new_ann_processed = self.process_ann(new_ann, from_rel)
             return self._get_best_ann_by_gao_rexford(current_ann, new_ann_processed)
         else:
@@ -207,91 +419,26 @@ class Policy:
         policy info if needed.
         """
         new_ann_processed = unprocessed_ann.copy(
-            as_path=(self.as_.asn, *unprocessed_ann.as_path),
+            as_path=(self.asn, *unprocessed_ann.as_path),
             recv_relationship=from_rel,
         )
-        if (
-            self.settings[Settings.BGP_I_SEC]
-            or self.settings[Settings.BGP_I_SEC_TRANSITIVE]
-        ):
-            new_ann_processed = BGPiSecTransitive.process_ann(
-                self, new_ann_processed, from_rel
-            )
-        elif self.settings[Settings.BGPSEC]:
-            new_ann_processed = BGPSec.process_ann(self, new_ann_processed, from_rel)
-        if self.settings[Settings.ROST]:
-            new_ann_processed = ROST.process_ann(self, new_ann_processed, from_rel)
+        for process_ann_func in self._process_ann_funcs:
+            new_ann_processed = process_ann_func(self, new_ann_processed, from_rel)
         return new_ann_processed
 
     def valid_ann(self, ann: Ann, from_rel: Relationships) -> bool:
         """Determine if an announcement is valid or should be dropped"""
 
-        settings = self.settings
-
-        if not BGP.valid_ann(self, ann, from_rel):
-            return False
-        # ASPAwN and ASRA are supersets of ASPA
-        if (
-            settings[Settings.ASPA]
-            and not settings[Settings.ASRA]
-            and not settings[Settings.ASPA_W_N]
-            and not ASPA.valid_ann(self, ann, from_rel)
-        ):
-            return False
-        if (
-            settings[Settings.ASPA_W_N]
-            and not settings[Settings.ASRA]
-            and not ASPAwN.valid_ann(self, ann, from_rel)
-        ):
-            return False
-        if settings[Settings.ASRA] and not ASRA.valid_ann(self, ann, from_rel):
-            return False
-        if settings[Settings.AS_PATH_EDGE_FILTER] and not ASPathEdgeFilter.valid_ann(
-            self, ann, from_rel
-        ):
-            return False
-        if settings[Settings.ENFORCE_FIRST_AS] and not EnforceFirstAS.valid_ann(
-            self, ann, from_rel
-        ):
-            return False
-        if settings[Settings.ONLY_TO_CUSTOMERS] and not OnlyToCustomers.valid_ann(
-            self, ann, from_rel
-        ):
-            return False
-        # All use ROV for validity
-        if (
-            settings[Settings.ROV]
-            or settings[Settings.ROVPP_V1_LITE]
-            or settings[Settings.ROVPP_V2_LITE]
-            or settings[Settings.ROVPP_V2I_LITE]
-        ) and not ROV.valid_ann(self, ann, from_rel):
-            return False
-        if settings[Settings.PEER_ROV] and not PeerROV.valid_ann(self, ann, from_rel):
-            return False
-        if settings[Settings.PATH_END] and not PathEnd.valid_ann(self, ann, from_rel):
-            return False
-        if settings[Settings.PEERLOCK_LITE] and not PeerLockLite.valid_ann(
-            self, ann, from_rel
-        ):
-            return False
-        if (
-            settings[Settings.BGP_I_SEC] or settings[Settings.BGP_I_SEC_TRANSITIVE]
-        ) and not BGPiSecTransitive.valid_ann(self, ann, from_rel):
-            return False
-        if settings[Settings.PROVIDER_CONE_ID] and not ProviderConeID.valid_ann(
-            self, ann, from_rel
-        ):
-            return False
-        if settings[Settings.ASPAPP] and not ASPAPP.valid_ann(self, ann, from_rel):
-            return False
-
+        if self._pipelines_settings is not self.settings:
+            self._set_pipelines()
+        for valid_ann_func in self._valid_ann_funcs:
+            if not valid_ann_func(self, ann, from_rel):
+                return False
         return True
 
     def ann_is_invalid_by_roa(self, ann: Ann) -> bool:
         """Determines if an announcement is invalid by a ROA"""
-        return ROAValidity.is_invalid(
-            self.route_validator.get_roa_outcome(ann.prefix, ann.origin)[0]
-        )
+        return self.route_validator.is_invalid(ann.prefix, ann.origin)
 
     ###############
     # Gao rexford #
@@ -302,75 +449,46 @@ class Policy:
         current_ann: Ann | None,
         new_ann: Ann,
     ) -> Ann:
-        """Determines if the new ann > current ann by Gao Rexford"""
+        """Determines if the new ann > current ann by Gao Rexford
+
+        In order: highest local pref (relationship), shortest AS path, BGPSec
+        (if set), and then lowest neighbor ASN
+        """
 
         assert new_ann is not None, "New announcement can't be None"
 
         # When I had this as a list of funcs, it was 7x slower, resulting in bottlenecks
-        # Gotta do it the ugly way unfortunately
-
-        # mypy also doesn't understand that current_ann can not be None for these funcs
-        final_ann = (
-            (new_ann if current_ann is None else None)
-            or self._get_best_ann_by_local_pref(current_ann, new_ann)  # type: ignore
-            or self._get_best_ann_by_as_path(current_ann, new_ann)  # type: ignore
-            # BGPSec is security third (see BGPSec class docstring)
-            # NOTE: BGPiSec policies don't change path preference for easier deployment
-            or (
-                self.settings[Settings.BGPSEC]
-                and BGPSec.get_best_ann_by_bgpsec(
-                    self,
-                    current_ann,  # type: ignore
-                    new_ann,
-                )
-            )
-            or self._get_best_ann_by_lowest_neighbor_asn_tiebreaker(
-                current_ann,  # type: ignore
-                new_ann,
-            )
-        )
-        if final_ann:
-            return final_ann
-        else:
-            raise GaoRexfordError("No ann was chosen")
-
-    def _get_best_ann_by_local_pref(self, current_ann: Ann, new_ann: Ann) -> Ann | None:
-        """Returns best announcement by local pref, or None if tie. Higher is better"""
+        # Since this runs for nearly every ann, it's now all inlined into one func
+        if current_ann is None:
+            return new_ann
 
-        if current_ann.recv_relationship.value > new_ann.recv_relationship.value:
+        # Local pref. Relationships is an IntEnum, so there's no need for .value
+        current_rel = current_ann.recv_relationship
+        new_rel = new_ann.recv_relationship
+        if current_rel > new_rel:
             return current_ann
-        elif current_ann.recv_relationship.value < new_ann.recv_relationship.value:
+        elif current_rel < new_rel:
             return new_ann
-        # mypy requires this and it can't be turned off
-        else:
-            return None
-
-    def _get_best_ann_by_as_path(self, current_ann: Ann, new_ann: Ann) -> Ann | None:
-        """Returns best announcement by as path length, or None if tie.
 
-        Shorter is better.
-        """
-
-        if len(current_ann.as_path) < len(new_ann.as_path):
+        # AS path length. Shorter is better
+        current_as_path = current_ann.as_path
+        new_as_path = new_ann.as_path
+        if len(current_as_path) < len(new_as_path):
             return current_ann
-        elif len(current_ann.as_path) > len(new_ann.as_path):
+        elif len(current_as_path) > len(new_as_path):
             return new_ann
-        # mypy requires this and it can't be turned off
-        else:
-            return None
-
-    def _get_best_ann_by_lowest_neighbor_asn_tiebreaker(
-        self, current_ann: Ann, new_ann: Ann
-    ) -> Ann:
-        """Determines if the new ann > current ann by Gao Rexford for ties
-
-        This breaks ties by lowest asn of the neighbor sending the announcement
-        So if the two announcements are from the same neighbor, return current ann
-        """
-
-        current_neighbor_asn = current_ann.as_path[min(len(current_ann.as_path), 1)]
-        new_neighbor_asn = new_ann.as_path[min(len(new_ann.as_path), 1)]
 
+        # BGPSec is security third (see BGPSec class docstring)
+        # NOTE: BGPiSec policies don't change path preference for easier deployment
+        if self.settings[Settings.BGPSEC]:
+            bgpsec_ann = BGPSec.get_best_ann_by_bgpsec(self, current_ann, new_ann)
+            if bgpsec_ann is not None:
+                return bgpsec_ann
+
+        # Lowest neighbor ASN tiebreaker. If the two announcements are from the
+        # same neighbor, the current ann is kept
+        current_neighbor_asn = current_as_path[min(len(current_as_path), 1)]
+        new_neighbor_asn = new_as_path[min(len(new_as_path), 1)]
         return current_ann if current_neighbor_asn <= new_neighbor_asn else new_ann
 
     def pre_propagation_hook(
@@ -415,24 +533,35 @@ class Policy:
         send_rels are the relationships that are acceptable to send
         """
 
-        neighbor_ases = self.as_.get_neighbor(propagate_to)
+        if self._pipelines_settings is not self.settings:
+            self._set_pipelines()
 
-        for _prefix, unprocessed_ann in self.local_rib.items():
+        neighbor_ases = self.as_.get_neighbor(propagate_to)
+        if not neighbor_ases:
+            return
+
+        asn = self.asn
+        for unprocessed_ann in self.local_rib.values():
+            # The ann's relationship is the same for every neighbor, so it's
+            # only checked once here (before copying), rather than per neighbor
+            if unprocessed_ann.recv_relationship not in send_rels:
+                continue
             # We must set the next_hop when sending
             # Copying announcements is a bottleneck for sims,
-            # so we try to do this as little as possible
-            if neighbor_ases and unprocessed_ann.recv_relationship in send_rels:
-                ann = unprocessed_ann.copy(next_hop_asn=self.as_.asn)
+            # so we try to do this as little as possible. Anns that this AS
+            # originated already have it as the next hop, so they're sent as is
+            if unprocessed_ann.next_hop_asn == asn:
+                ann = unprocessed_ann
             else:
-                continue
+                ann = unprocessed_ann.copy(next_hop_asn=asn)
 
             for neighbor_as in neighbor_ases:
-                if ann.recv_relationship in send_rels and (
-                    not self.settings[Settings.BGP_FULL]
-                    or not self._prev_sent(neighbor_as, ann)
-                ):
-                    # Policy took care of it's own propagation for this ann
-                    if self.policy_propagate(neighbor_as, ann, propagate_to, send_rels):
+                if not self._bgp_full or not self._prev_sent(neighbor_as, ann):
+                    # Policy took care of it's own propagation for this ann.
+                    # Without any policy_propagate funcs (most ASes), it can't
+                    if self._policy_propagate_funcs and self.policy_propagate(
+                        neighbor_as, ann, propagate_to, send_rels
+                    ):
                         continue
                     else:
                         self.process_outgoing_ann(
@@ -459,87 +588,10 @@ class Policy:
         """
 
         og_ann = ann
-        if (
-            self.settings[Settings.BGP_I_SEC]
-            or self.settings[Settings.BGP_I_SEC_TRANSITIVE]
-        ):
-            policy_propagate_info = BGPiSecTransitive.get_policy_propagate_vals(
-                self, neighbor_as, ann, propagate_to, send_rels
-            )
-            if policy_propagate_info.policy_propagate_bool:
-                ann = policy_propagate_info.ann
-                if not policy_propagate_info.send_ann_bool:
-                    return True
-        # NOTE: THIS MUST BE ELIF!! BGPiSecTransitive is a superset of BGPSec and has
-        # different get_policy_propagate_vals
-        elif self.settings[Settings.BGPSEC]:
-            policy_propagate_info = BGPSec.get_policy_propagate_vals(
-                self, neighbor_as, ann, propagate_to, send_rels
-            )
-            if policy_propagate_info.policy_propagate_bool:
-                ann = policy_propagate_info.ann
-                if not policy_propagate_info.send_ann_bool:
-                    return True
-
-        if self.settings[Settings.ONLY_TO_CUSTOMERS]:
-            policy_propagate_info = OnlyToCustomers.get_policy_propagate_vals(
-                self, neighbor_as, ann, propagate_to, send_rels
-            )
-            if policy_propagate_info.policy_propagate_bool:
-                ann = policy_propagate_info.ann
-                if not policy_propagate_info.send_ann_bool:
-                    return True
-
-        if self.settings[Settings.ROVPP_V2I_LITE]:
-            policy_propagate_info = ROVPPV2iLite.get_policy_propagate_vals(
-                self, neighbor_as, ann, propagate_to, send_rels
-            )
-            if policy_propagate_info.policy_propagate_bool:
-                ann = policy_propagate_info.ann
-                if not policy_propagate_info.send_ann_bool:
-                    return True
-        # If V2i is deployed, don't use V2
-        elif self.settings[Settings.ROVPP_V2_LITE]:
-            policy_propagate_info = ROVPPV2Lite.get_policy_propagate_vals(
-                self, neighbor_as, ann, propagate_to, send_rels
-            )
-            if policy_propagate_info.policy_propagate_bool:
-                ann = policy_propagate_info.ann
-                if not policy_propagate_info.send_ann_bool:
-                    return True
-        # If v2i or v2 are set, don't use v1 (since they are supersets)
-        elif self.settings[Settings.ROVPP_V1_LITE]:
-            policy_propagate_info = ROVPPV1Lite.get_policy_propagate_vals(
-                self, neighbor_as, ann, propagate_to, send_rels
-            )
-            if policy_propagate_info.policy_propagate_bool:
-                ann = policy_propagate_info.ann
-                if not policy_propagate_info.send_ann_bool:
-                    return True
-
-        if self.settings[Settings.ORIGIN_PREFIX_HIJACK_CUSTOMERS]:
-            policy_propagate_info = (
-                OriginPrefixHijackCustomers.get_policy_propagate_vals(
-                    self, neighbor_as, ann, propagate_to, send_rels
-                )
-            )
-            if policy_propagate_info.policy_propagate_bool:
-                ann = policy_propagate_info.ann
-                if not policy_propagate_info.send_ann_bool:
-                    return True
-        if self.settings[Settings.FIRST_ASN_STRIPPING_PREFIX_HIJACK_CUSTOMERS]:
-            policy_propagate_info = (
-                FirstASNStrippingPrefixHijackCustomers.get_policy_propagate_vals(
-                    self, neighbor_as, ann, propagate_to, send_rels
-                )
-            )
-            if policy_propagate_info.policy_propagate_bool:
-                ann = policy_propagate_info.ann
-                if not policy_propagate_info.send_ann_bool:
-                    return True
-
-        if self.settings[Settings.NEVER_PROPAGATE_WITHDRAWALS]:
-            policy_propagate_info = NeverPropagateWithdrawals.get_policy_propagate_vals(
+        if self._pipelines_settings is not self.settings:
+            self._set_pipelines()
+        for get_policy_propagate_vals in self._policy_propagate_funcs:
+            policy_propagate_info = get_policy_propagate_vals(
                 self, neighbor_as, ann, propagate_to, send_rels
             )
             if policy_propagate_info.policy_propagate_bool:
@@ -547,8 +599,9 @@ class Policy:
                 if not policy_propagate_info.send_ann_bool:
                     return True
 
-        if og_ann != ann:
-            if not ann.withdraw and self.settings[Settings.BGP_FULL]:
+        # Identity first, since the ann is usually unchanged (and __eq__ is slow)
+        if og_ann is not ann and og_ann != ann:
+            if not ann.withdraw and self._bgp_full:
                 self.adj_ribs_out.add_ann(neighbor_as.asn, ann)
             self.process_outgoing_ann(neighbor_as, ann, propagate_to, send_rels)
             return True
@@ -564,7 +617,7 @@ class Policy:
     ) -> None:
         """Adds ann to the neighbors recv q"""
 
-        if not ann.withdraw and self.settings[Settings.BGP_FULL]:
+        if not ann.withdraw and self._bgp_full:
             self.adj_ribs_out.add_ann(neighbor_as.asn, ann)
         # Add the new ann to the incoming anns for that prefix
         neighbor_as.policy.receive_ann(ann)
@@ -576,20 +629,17 @@ class Policy:
     def get_most_specific_ann(self, dest_ip_addr: IPAddr) -> Ann | None:
         """Returns the most specific announcement for a destination IP address
 
-        Uses caching whenever possible to avoid expensive lookups at each AS
-        however, don't cache large RIBs, there won't be duplicates,
-        and don't keep too many in the cache, there won't be duplicates
-        We need to watch our RAM here
+        This is a linear scan over the local RIB, which in simulations only holds
+        a handful of prefixes, and runs once per AS per data plane traceback
 
         NOTE: Caching actually slowed this down by about 1.5x so we don't do it anymore
         """
 
-        matching_prefixes = sorted(
+        most_specific_prefix = max(
             (p for p in self.local_rib if p.supernet_of(dest_ip_addr)),
             key=lambda p: p.prefixlen,
-            reverse=True,
+            default=None,
         )
-        most_specific_prefix = matching_prefixes[0] if matching_prefixes else None
 
         return self.local_rib[most_specific_prefix] if most_specific_prefix else None
 
@@ -651,7 +701,7 @@ class Policy:
         Note that withdraw_ann is a deep copied ann
         """
         assert withdraw_ann.withdraw is True
-        assert withdraw_ann.next_hop_asn == self.as_.asn
+        assert withdraw_ann.next_hop_asn == self.asn
         if self.settings[Settings.ROST]:
             ROST.withdraw_ann_from_neighbors(self, withdraw_ann)
         # Check adj_ribs_out to see where the withdrawn ann was sent
@@ -685,7 +735,8 @@ class Policy:
     def _get_and_process_best_adj_ribs_in_ann(self, prefix: Prefix) -> "Ann | None":
         """Selects best ann from ribs in (remember, AdjRIBsIn is unprocessed"""
 
-        # Get the best announcement
+        # Get the best announcement. The order of the AnnInfos doesn't matter,
+        # since the Gao Rexford tiebreakers end with the lowest neighbor ASN
         best_ann: Ann | None = None
         for ann_info in self.adj_ribs_in.get_ann_infos(prefix):
             # This also processes the announcement
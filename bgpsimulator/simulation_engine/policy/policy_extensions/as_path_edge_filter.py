@@ -14,12 +14,15 @@ class ASPathEdgeFilter:
     def valid_ann(policy: "Policy", ann: "Ann", from_rel: Relationships) -> bool:
         """Returns invalid if an edge AS is announcing a path containing other ASNs"""
 
-        origin_asn = ann.as_path[0]
+        as_path = ann.as_path
+        origin_asn = as_path[0]
 
         if origin_asn in policy.as_.neighbor_asns:
             neighbor_as_obj = policy.as_.as_graph.as_dict[origin_asn]
-            if (neighbor_as_obj.stub or neighbor_as_obj.multihomed) and set(
-                ann.as_path
-            ) != {neighbor_as_obj.asn}:
+            # Any ASN other than the edge AS's own (prepending is fine). Counted
+            # in C rather than building a set of the path for every ann
+            if (neighbor_as_obj.stub or neighbor_as_obj.multihomed) and as_path.count(
+                origin_asn
+            ) != len(as_path):
                 return False
         return True
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from bgpsimulator.shared.enums import Relationships, Settings
+from bgpsimulator.shared.enums import ASPA_SETTING, Relationships
 
 if TYPE_CHECKING:
     from bgpsimulator.simulation_engine import Announcement as Ann
@@ -10,7 +10,7 @@ if TYPE_CHECKING:
 class ASPA:
     """A Policy that deploys ASPA and ASPA Records
 
-    We experimented with adding a cache to the provider_check
+    We experimented with adding a cache to the provider check
     but this has a negligible impact on performance
 
     Removing the path reversals sped up performance by about 5%
@@ -26,7 +26,9 @@ class ASPA:
 
         # Note: This first if check has to be removed if you want to implement
         # route server to RS-Client behaviour
-        if not ASPA._next_hop_valid(policy, ann):
+        # Ensures the next hop is the first ASN in the AS-Path. Route servers are
+        # allowed to strip their own ASN (and in most cases are obligated to)
+        if ann.next_hop_asn != ann.as_path[0] and not policy.as_.ixp:
             return False
         # Most ASes recieve anns from providers (moved here for speed)
         elif from_rel == Relationships.PROVIDERS:
@@ -36,16 +38,6 @@ class ASPA:
         else:
             raise NotImplementedError("Should never reach here")
 
-    @staticmethod
-    def _next_hop_valid(policy: "Policy", ann: "Ann") -> bool:
-        """Ensures the next hop is the first ASN in the AS-Path
-
-        Route servers are allowed to strip their own ASN (and in most cases are
-        obligated to)
-        """
-
-        return ann.next_hop_asn == ann.as_path[0] or policy.as_.ixp
-
     @staticmethod
     def _upstream_check(
         policy: "Policy", ann: "Ann", from_rel: "Relationships"
@@ -60,14 +52,16 @@ class ASPA:
         # Since this is checking from customers
 
         # 4. If max_up_ramp < N, the procedure halts with the outcome "Invalid".
-        elif ASPA._get_max_up_ramp_length(policy, ann) < len(ann.as_path):
+        elif ASPA._get_max_up_ramp_length(policy, ann.as_path[::-1]) < len(ann.as_path):
             return False
 
         # ASPA valid or unknown
         return True
 
     @staticmethod
-    def _get_max_up_ramp_length(policy: "Policy", ann: "Ann") -> int:
+    def _get_max_up_ramp_length(
+        policy: "Policy", reversed_path: tuple[int, ...]
+    ) -> int:
         """See desc
 
         Determine the maximum up-ramp length as I, where I is the minimum
@@ -77,14 +71,29 @@ class ASPA:
 
         The up-ramp starts at AS(1) and each hop AS(i) to AS(i+1) represents
         Customer and Provider peering relationship. [i.e they reverse the path]
-        """
 
-        reversed_path = ann.as_path[::-1]
+        The path is reversed by the caller, so that it's only reversed once
+        when both ramps are needed
+
+        authorized(A(I), A(I+1)) is inlined here (and in the down-ramp) since
+        it's called for every hop. It returns "Not Provider+" only if A(I)
+        adopts ASPA and A(I+1) is not one of its providers. Otherwise it's
+        "No Attestation" or "Provider+". This also essentially takes the place
+        of the "hop check" listed in ASPA RFC section 5 in ASPA v16.
+        If either AS doesn't exist, this still works properly, since
+        provider_asns only contains ASNs that are in the AS graph
+        """
 
+        as_dict = policy.as_.as_graph.as_dict
         for i in range(len(reversed_path) - 1):
-            if not ASPA._provider_check(policy, reversed_path[i], reversed_path[i + 1]):
+            cur_as_obj = as_dict.get(reversed_path[i])
+            if (
+                cur_as_obj
+                and cur_as_obj.policy.settings[ASPA_SETTING]
+                and reversed_path[i + 1] not in cur_as_obj.provider_asns
+            ):
                 return i + 1
-        return len(ann.as_path)
+        return len(reversed_path)
 
     @staticmethod
     def _downstream_check(
@@ -94,16 +103,22 @@ class ASPA:
 
         # 4. If max_up_ramp + max_down_ramp < N,
         # the procedure halts with the outcome "Invalid".
-        max_up_ramp = ASPA._get_max_up_ramp_length(policy, ann)
-        max_down_ramp = ASPA._get_max_down_ramp_length(policy, ann)
-        if max_up_ramp + max_down_ramp < len(ann.as_path):
+        reversed_path = ann.as_path[::-1]
+        max_up_ramp = ASPA._get_max_up_ramp_length(policy, reversed_path)
+        # The down ramp can't make the sum any smaller, so only compute it if needed
+        if max_up_ramp >= len(reversed_path):
+            return True
+        max_down_ramp = ASPA._get_max_down_ramp_length(policy, reversed_path)
+        if max_up_ramp + max_down_ramp < len(reversed_path):
             return False
 
         # ASPA Valid or Unknown (but not invalid)
         return True
 
     @staticmethod
-    def _get_max_down_ramp_length(policy: "Policy", ann: "Ann") -> int:
+    def _get_max_down_ramp_length(
+        policy: "Policy", reversed_path: tuple[int, ...]
+    ) -> int:
         """See desc
 
         Similarly, the maximum down-ramp length can be determined as N - J +
@@ -116,35 +131,18 @@ class ASPA:
         AS(j-1) represents Customer and Provider peering relationship
         """
 
-        reversed_path = ann.as_path[::-1]
-
         # We want the max J, so start at the end of the reversed Path
         # This is the most efficient way to traverse this
+        as_dict = policy.as_.as_graph.as_dict
         for i in range(len(reversed_path) - 1, 0, -1):
-            if not ASPA._provider_check(policy, reversed_path[i], reversed_path[i - 1]):
+            # authorized(A(J), A(J-1)), inlined (see the up-ramp)
+            cur_as_obj = as_dict.get(reversed_path[i])
+            if (
+                cur_as_obj
+                and cur_as_obj.policy.settings[ASPA_SETTING]
+                and reversed_path[i - 1] not in cur_as_obj.provider_asns
+            ):
                 # Must add one due to zero indexing in python, vs 1 indexing in RFC
                 J = i + 1
                 return len(reversed_path) - J + 1
-        return len(ann.as_path)
-
-    @staticmethod
-    def _provider_check(policy: "Policy", asn1: int, asn2: int) -> bool:
-        """Returns False if asn2 is not in asn1's provider_asns, AND asn1 adopts ASPA
-
-        This also essentially can take the place of the "hop check" listed in
-        ASPA RFC section 5 in ASPA v16
-        or in ASPAv18 it takes the place of the provider auth func
-
-        False indicates Not Provider+
-        True indicates No Attestation or Provider+
-
-        Updated so that if either AS doesn't exist, this function returns properly
-        """
-
-        cur_as_obj = policy.as_.as_graph.as_dict.get(asn1)
-        if cur_as_obj and cur_as_obj.policy.settings[Settings.ASPA]:
-            next_as_obj = policy.as_.as_graph.as_dict.get(asn2)
-            next_asn = next_as_obj.asn if next_as_obj else next_as_obj
-            if next_asn not in cur_as_obj.provider_asns:
-                return False
-        return True
+        return len(reversed_path)
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from bgpsimulator.shared import Relationships, Settings
+from bgpsimulator.shared import ASPA_W_N_SETTING, Relationships
 
 from .aspa import ASPA
 
@@ -38,7 +38,7 @@ class ASPAwN:
             # Get the AS object for the current AS in the AS Path
             asra_as_obj = as_dict.get(asn)
             # If the AS is an ASRA AS
-            if asra_as_obj and asra_as_obj.policy.settings[Settings.ASPA_W_N]:
+            if asra_as_obj and asra_as_obj.policy.settings[ASPA_W_N_SETTING]:
                 # Check that both of it's neighbors are in the valid next hops
                 for neighbor_index in (i - 1, i + 1):
                     # Can't use try except IndexError here, since -1 is a valid index
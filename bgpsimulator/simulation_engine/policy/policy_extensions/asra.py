@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from bgpsimulator.shared.enums import Relationships, Settings
+from bgpsimulator.shared.enums import ASPA_SETTING, ASRA_SETTING, Relationships
 
 from .aspa import ASPA
 
@@ -81,7 +81,7 @@ class ASRA:
             # 1/5/2024 JF: Added check for if as1_obj doesn't exist
             # If asn1 does not adopt ASPA, we treat that
             # as 'No Attestation', so min_up_ramp ends here.
-            if not asn1_obj or not asn1_obj.policy.settings[Settings.ASPA]:
+            if not asn1_obj or not asn1_obj.policy.settings[ASPA_SETTING]:
                 return i
 
             # If asn2 is not in asn1's provider list => 'Not Provider+',
@@ -113,14 +113,14 @@ class ASRA:
         # 1) asn1 adopts ASPA and does NOT list asn2 as a provider
         has_aspa_but_not_provider = bool(
             asn1_obj
-            and asn1_obj.policy.settings[Settings.ASPA]
+            and asn1_obj.policy.settings[ASPA_SETTING]
             and asn2 not in asn1_obj.provider_asns
         )
 
         # 2) asn1 also adopts ASRA and does NOT list asn2 as neighbor
         has_asra_but_not_neighbor = bool(
             asn1_obj
-            and asn1_obj.policy.settings[Settings.ASRA]
+            and asn1_obj.policy.settings[ASRA_SETTING]
             and asn2 not in asn1_obj.neighbor_asns
         )
 
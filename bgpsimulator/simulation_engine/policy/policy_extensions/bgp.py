@@ -15,4 +15,4 @@ class BGP:
         """Determine if an announcement is valid or should be dropped"""
 
         # BGP Loop Prevention Check; no AS 0 either
-        return policy.as_.asn not in ann.as_path and 0 not in ann.as_path
+        return policy.asn not in ann.as_path and 0 not in ann.as_path
@@ -1,6 +1,11 @@
 from typing import TYPE_CHECKING
 
-from bgpsimulator.shared import PolicyPropagateInfo, Relationships, Settings
+from bgpsimulator.shared import (
+    BGP_I_SEC_SETTING,
+    BGP_I_SEC_TRANSITIVE_SETTING,
+    PolicyPropagateInfo,
+    Relationships,
+)
 
 from .bgpsec import BGPSec
 
@@ -43,7 +48,7 @@ class BGPiSecTransitive:
     def process_ann(policy: "Policy", ann: "Ann", from_rel: Relationships) -> "Ann":
         """Sets the bgpsec_as_path always for transitive signatures"""
 
-        return ann.copy(bgpsec_as_path=(policy.as_.asn, *ann.bgpsec_as_path))
+        return ann.copy(bgpsec_as_path=(policy.asn, *ann.bgpsec_as_path))
 
     @staticmethod
     def valid_ann(policy: "Policy", ann: "Ann", from_rel: Relationships) -> bool:
@@ -58,8 +63,8 @@ class BGPiSecTransitive:
         bgpsec_signatures = ann.bgpsec_as_path
         for asn in ann.as_path:
             if asn not in bgpsec_signatures and (
-                as_graph.as_dict[asn].policy.settings[Settings.BGP_I_SEC]
-                or as_graph.as_dict[asn].policy.settings[Settings.BGP_I_SEC_TRANSITIVE]
+                as_graph.as_dict[asn].policy.settings[BGP_I_SEC_SETTING]
+                or as_graph.as_dict[asn].policy.settings[BGP_I_SEC_TRANSITIVE_SETTING]
             ):
                 return False
         return True
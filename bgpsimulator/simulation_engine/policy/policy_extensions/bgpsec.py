@@ -23,16 +23,14 @@ class BGPSec:
         """Seeds an announcement into the local RIB and inits bgpsec_as_path"""
 
         # If the path is valid, add bgpsec_as_path
-        if ann.as_path == (policy.as_.asn,):
+        if ann.as_path == (policy.asn,):
             return ann.copy(bgpsec_as_path=ann.as_path)
         return ann
 
     @staticmethod
     def bgpsec_valid(policy: "Policy", ann: "Ann") -> bool:
         """Checks if an announcement is valid for BGPSEC"""
-        return (
-            ann.bgpsec_next_asn == policy.as_.asn and ann.bgpsec_as_path == ann.as_path
-        )
+        return ann.bgpsec_next_asn == policy.asn and ann.bgpsec_as_path == ann.as_path
 
     @staticmethod
     def get_policy_propagate_vals(
@@ -19,8 +19,9 @@ class EnforceFirstAS:
         is a neighbor to simulate, since we've always picked attackers at the edge
         """
 
+        next_hop_asn = ann.next_hop_asn
         return (
-            ann.next_hop_asn == ann.as_path[0]
+            next_hop_asn == ann.as_path[0]
             # Super janky, TODO
-            and ann.next_hop_asn in policy.as_.neighbor_asns
+            and next_hop_asn in policy.as_.neighbor_asns
         )
@@ -35,7 +35,7 @@ class OnlyToCustomers:
         """If propagating to custmoers and only_to_customers isn't set, set it"""
 
         if propagate_to in (Relationships.CUSTOMERS, Relationships.PEERS):
-            ann = ann.copy(only_to_customers=policy.as_.asn)
+            ann = ann.copy(only_to_customers=policy.asn)
             policy.process_outgoing_ann(neighbor_as_obj, ann, propagate_to, send_rels)
             return PolicyPropagateInfo(
                 policy_propagate_bool=True, ann=ann, send_ann_bool=True
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from bgpsimulator.shared.enums import Relationships, Settings
+from bgpsimulator.shared.enums import PATH_END_SETTING, Relationships
 
 if TYPE_CHECKING:
     from bgpsimulator.simulation_engine import Announcement as Ann
@@ -27,7 +27,7 @@ class PathEnd:
         # If the origin is deploying pathend and the path is longer than 1
         if (
             origin_as_obj
-            and origin_as_obj.policy.settings[Settings.PATH_END]
+            and origin_as_obj.policy.settings[PATH_END_SETTING]
             and len(ann.as_path) > 1
         ):
             # If the provider is real, do the loop check
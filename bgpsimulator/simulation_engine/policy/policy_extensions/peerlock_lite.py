@@ -14,11 +14,8 @@ class PeerLockLite:
     def valid_ann(policy: "Policy", ann: "Ann", from_rel: Relationships) -> bool:
         """Returns False if ann is PeerLock Lite invalid"""
 
-        as_dict = policy.as_.as_graph.as_dict
         if from_rel == Relationships.CUSTOMERS:
             # Tier-1 ASes have no providers, so if they are your customer,
             # there is a route leakage
-            for asn in ann.as_path:
-                if as_dict[asn].tier_1:
-                    return False
+            return policy.as_.as_graph.tier_1_asns.isdisjoint(ann.as_path)
         return True
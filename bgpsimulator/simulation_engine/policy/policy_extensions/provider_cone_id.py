@@ -1,6 +1,11 @@
 from typing import TYPE_CHECKING
 
-from bgpsimulator.shared import Relationships, Settings
+from bgpsimulator.shared import (
+    ASPAPP_SETTING,
+    BGP_I_SEC_SETTING,
+    PROVIDER_CONE_ID_SETTING,
+    Relationships,
+)
 
 if TYPE_CHECKING:
     from bgpsimulator.simulation_engine import Announcement as Ann
@@ -22,12 +27,12 @@ class ProviderConeID:
             provider_cone_asns = as_dict[ann.origin].provider_cone_asns
             # We don't look at the last ASN in the path, since that's the origin
             # The ASes ASN is also not yet in the announcement, so we add it here
-            for asn in (policy.as_.asn, *ann.as_path[:-1]):
+            for asn in (policy.asn, *ann.as_path[:-1]):
                 # not in provider cone of the origin, and is adopting
                 if asn not in provider_cone_asns and (
-                    as_dict[asn].policy.settings[Settings.BGP_I_SEC]
-                    or as_dict[asn].policy.settings[Settings.PROVIDER_CONE_ID]
-                    or as_dict[asn].policy.settings[Settings.ASPAPP]
+                    as_dict[asn].policy.settings[BGP_I_SEC_SETTING]
+                    or as_dict[asn].policy.settings[PROVIDER_CONE_ID_SETTING]
+                    or as_dict[asn].policy.settings[ASPAPP_SETTING]
                 ):
                     return False
 
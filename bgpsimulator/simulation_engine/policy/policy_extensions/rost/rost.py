@@ -14,9 +14,7 @@ class ROST:
     def withdraw_ann_from_neighbors(policy: "Policy", withdraw_ann: "Ann") -> None:
         """Adds withdrawals you create to RoST Trusted Repo"""
 
-        policy.rost_trusted_repository.add_ann(
-            withdraw_ann, policy.as_.asn, active=False
-        )
+        policy.rost_trusted_repository.add_ann(withdraw_ann, policy.asn, active=False)
 
     @staticmethod
     def preprocess_incoming_anns(
@@ -36,7 +34,7 @@ class ROST:
         """sets local rib anns to active in rost trusted repo"""
 
         for ann in policy.local_rib.values():
-            policy.rost_trusted_repository.add_ann(ann, policy.as_.asn, active=True)
+            policy.rost_trusted_repository.add_ann(ann, policy.asn, active=True)
 
     @staticmethod
     def remove_anns_from_recv_q_that_should_be_withdrawn(policy: "Policy") -> None:
@@ -70,7 +68,7 @@ class ROST:
                     not withdrawal_in_recv_q
                     and policy.rost_trusted_repository.seen_withdrawal(adj_ribs_in_ann)
                 ):
-                    policy.recv_q[adj_ribs_in_ann.prefix].append(
+                    policy.recv_q.setdefault(adj_ribs_in_ann.prefix, []).append(
                         adj_ribs_in_ann.copy(withdraw=True)
                     )
 
@@ -78,4 +76,4 @@ class ROST:
     def process_ann(policy: "Policy", ann: "Ann", from_rel: "Relationships") -> "Ann":
         """Processes an announcement for RoST"""
 
-        return ann.copy(rost_ids=(policy.as_.asn, *ann.rost_ids))
+        return ann.copy(rost_ids=(policy.asn, *ann.rost_ids))
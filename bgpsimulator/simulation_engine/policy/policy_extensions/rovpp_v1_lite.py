@@ -65,8 +65,8 @@ class ROVPPV1Lite:
                 non_routed_blackholes_to_add.append(
                     Ann(
                         prefix=roa.prefix,
-                        next_hop_asn=policy.as_.asn,
-                        as_path=(policy.as_.asn,),
+                        next_hop_asn=policy.asn,
+                        as_path=(policy.asn,),
                         # Victim's timestamp since it's upon ROA creation pre-attacker
                         timestamp=Timestamps.LEGITIMATE_ORIGIN,
                         recv_relationship=Relationships.ORIGIN,
@@ -89,7 +89,7 @@ class ROVPPV1Lite:
                 processed_sub_ann = policy.process_ann(unprocessed_sub_ann, from_rel)
                 # Add blackhole attributes to the processed ann
                 blackhole_ann = processed_sub_ann.copy(
-                    next_hop_asn=policy.as_.asn,
+                    next_hop_asn=policy.asn,
                     rovpp_blackhole=True,
                 )
                 routed_blackholes_to_add.append(blackhole_ann)
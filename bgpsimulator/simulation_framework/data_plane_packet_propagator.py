@@ -47,11 +47,16 @@ class DataPlanePacketPropagator:
         attacker_asns: set[int],
         scenario: Scenario,
     ):
-        """Recursively stores the outcomes of the AS on the data plane"""
+        """Stores the outcomes of the AS (and its traceback) on the data plane
 
-        if as_obj.asn in outcomes:
-            return outcomes[as_obj.asn]
-        else:
+        Follows the next hops iteratively rather than recursing, which avoids
+        a deeply nested call (with all of these args) for every hop. Every AS
+        along the traceback gets the same outcome as the AS it ends at
+        """
+
+        as_dict = engine.as_graph.as_dict
+        traceback_asns: list[int] = []
+        while as_obj.asn not in outcomes:
             most_specific_ann = as_obj.policy.get_most_specific_ann(dest_ip_addr)
             outcome = self._determine_data_plane_outcome(
                 as_obj,
@@ -63,33 +68,24 @@ class DataPlanePacketPropagator:
                 attacker_asns,
                 scenario,
             )
-            if outcome == Outcomes.UNDETERMINED:
-                # outcome won't ever be undetermined if most_specific_ann is None
-                assert most_specific_ann, "for mypy"
-
-                # next as in the AS path to traceback to
-                # Ignore type because only way for this to be here
-                # Is if the most specific "Ann" was NOT None.
-                next_as = engine.as_graph.as_dict[
-                    # NOTE: this is the next hop,
-                    # not the next ASN in the AS PATH
-                    # This is more in line with real BGP and allows for more
-                    # advanced types of hijacks such as origin spoofing hijacks
-                    most_specific_ann.next_hop_asn
-                ]
-                visited_asns.add(as_obj.asn)
-                outcome = self.store_as_data_plane_outcomes(
-                    next_as,
-                    engine,
-                    dest_ip_addr,
-                    outcomes,
-                    visited_asns,
-                    legitimate_origin_asns,
-                    attacker_asns,
-                    scenario,
-                )
-            outcomes[as_obj.asn] = outcome
-            return outcome
+            if outcome != Outcomes.UNDETERMINED:
+                outcomes[as_obj.asn] = outcome
+                break
+            # outcome won't ever be undetermined if most_specific_ann is None
+            assert most_specific_ann, "for mypy"
+            traceback_asns.append(as_obj.asn)
+            visited_asns.add(as_obj.asn)
+            # NOTE: this is the next hop, not the next ASN in the AS PATH
+            # This is more in line with real BGP and allows for more
+            # advanced types of hijacks such as origin spoofing hijacks
+            as_obj = as_dict[most_specific_ann.next_hop_asn]
+        else:
+            outcome = outcomes[as_obj.asn]
+        # Stored from the end of the traceback back to the start, same as
+        # the recursion would, so the outcomes dict order is unchanged
+        for asn in reversed(traceback_asns):
+            outcomes[asn] = outcome
+        return outcome
 
     def _determine_data_plane_outcome(
         self,
@@ -112,7 +108,7 @@ class DataPlanePacketPropagator:
         elif (
             most_specific_ann is None
             or len(most_specific_ann.as_path) == 1
-            or most_specific_ann.recv_relationship.value == Relationships.ORIGIN.value
+            or most_specific_ann.recv_relationship == Relationships.ORIGIN
             or most_specific_ann.next_hop_asn == as_obj.asn
             or not as_obj.policy.passes_sav(dest_ip_addr, most_specific_ann)
         ):
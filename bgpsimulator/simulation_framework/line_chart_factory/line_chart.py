@@ -3,9 +3,6 @@ from pathlib import Path
 from statistics import mean
 from typing import Any
 
-import matplotlib as mpl
-import matplotlib.pyplot as plt
-
 from bgpsimulator.simulation_framework.data_tracker import LineFilter
 
 from .line import Line
@@ -37,6 +34,11 @@ class LineChart:
     def write_graph(self, path: Path) -> None:
         """Writes the graph to a file"""
 
+        # matplotlib takes longer to import than the rest of bgpsimulator
+        # combined, so only import it once a graph is actually written
+        import matplotlib as mpl  # noqa: PLC0415
+        import matplotlib.pyplot as plt  # noqa: PLC0415
+
         mpl.use("Agg")
         fig, ax = plt.subplots()
         fig.set_dpi(300)
@@ -4,9 +4,9 @@ from functools import cached_property
 from typing import TYPE_CHECKING, ClassVar
 
 from bgpsimulator.route_validator import ROA, RouteValidator
-from bgpsimulator.shared import IPAddr, Settings
+from bgpsimulator.shared import IPAddr
 from bgpsimulator.simulation_engine import Announcement as Ann
-from bgpsimulator.simulation_engine import SimulationEngine
+from bgpsimulator.simulation_engine import Policy, SimulationEngine
 
 if TYPE_CHECKING:
     from bgpsimulator.as_graphs import AS
@@ -317,7 +317,8 @@ class Scenario:
 
         # NOTE: Most important updates go last
 
-        settings = [False for _ in Settings]
+        # Copying the precomputed defaults is much faster than iterating the enum
+        settings = list(Policy.default_settings)
 
         for setting, val in self.scenario_config.default_base_settings.items():
             settings[setting] = val
@@ -1,7 +1,9 @@
 import argparse
 import gc
+import hashlib
 import json
 import os
+import pickle
 import random
 import shutil
 import time
@@ -17,18 +19,20 @@ import psutil
 from tqdm import tqdm
 
 from bgpsimulator.as_graphs import (
+    AS,
     ASGraph,
     CAIDAASGraphCollector,
     CAIDAASGraphJSONConverter,
 )
 from bgpsimulator.shared import (
+    SINGLE_DAY_CACHE_DIR,
     ASNGroups,
     InAdoptingASNs,
     Outcomes,
     Settings,
     bgpsimulator_logger,
 )
-from bgpsimulator.simulation_engine import Policy, SimulationEngine
+from bgpsimulator.simulation_engine import Announcement, Policy, SimulationEngine
 
 from .data_plane_packet_propagator import DataPlanePacketPropagator
 from .data_tracker.data_tracker import DataTracker
@@ -43,6 +47,11 @@ if TYPE_CHECKING:
 
     from bgpsimulator.simulation_framework.scenarios.scenario import Scenario
 
+# Part of the ASGraph pickle's cache key. Bump this whenever the pickled ASGraph
+# changes in a way that the pickled attrs/slots below don't capture (e.g. a new
+# ASGraph attribute), so that older pickles aren't loaded
+AS_GRAPH_PICKLE_VERSION = 1
+
 parser = argparse.ArgumentParser(description="Runs BGPy simulations")
 parser.add_argument(
     "--num_trials",
@@ -97,6 +106,9 @@ class Simulation:
         )
         self.scenario_configs: tuple[ScenarioConfig, ...] = scenario_configs
         self.num_trials: int = num_trials
+        # Checked before the ASGraph is built, since nothing could be aggregated
+        if self.num_trials < 1:
+            raise ValueError(f"num_trials must be at least 1, not {num_trials}")
         self.parse_cpus: int = parse_cpus
         self.python_hash_seed: int | None = python_hash_seed
         self._seed_random()
@@ -107,6 +119,7 @@ class Simulation:
                 caida_as_graph_path=caida_path
             )
         self.as_graph_data_json_path: Path = as_graph_data_json_path
+        self._write_as_graph_pickle()
 
         self.line_filters = line_filters
         if not self.line_filters:
@@ -149,6 +162,75 @@ class Simulation:
                 raise RuntimeError(msg)
             random.seed(str(self.python_hash_seed) + seed_suffix)
 
+    def _write_as_graph_pickle(self) -> None:
+        """Builds the ASGraph once and caches it as a pickle
+
+        Building the graph from JSON (creating every AS, policy, relation, etc)
+        is expensive, and otherwise it would be done for every chunk
+        """
+
+        if not self.as_graph_pickle_path.exists():
+            as_graph = self._get_as_graph_from_json()
+            # Write to a tmp file first so a partially written pickle is never read
+            tmp_path = self.as_graph_pickle_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(
+                pickle.dumps(as_graph, protocol=pickle.HIGHEST_PROTOCOL)
+            )
+            # Free the graph now rather than whenever the cyclic GC runs (which
+            # may be after the workers fork), same as in _run_chunk
+            as_graph.close()
+            tmp_path.replace(self.as_graph_pickle_path)
+
+    def _load_as_graph(self) -> ASGraph:
+        """Loads the pickled ASGraph, rebuilding it from JSON if that fails
+
+        (e.g. if the pickle was deleted, truncated, or refers to a class that
+        was moved). Anything else is a bug, so it isn't caught
+        """
+
+        try:
+            return pickle.loads(self.as_graph_pickle_path.read_bytes())  # noqa: S301
+        except (
+            OSError,
+            EOFError,
+            pickle.UnpicklingError,
+            AttributeError,
+            ImportError,
+        ) as e:
+            bgpsimulator_logger.warning(
+                f"Failed to load {self.as_graph_pickle_path} ({e!r}), "
+                "building the ASGraph from JSON instead"
+            )
+            return self._get_as_graph_from_json()
+
+    def _get_as_graph_from_json(self) -> ASGraph:
+        """Builds the ASGraph from the AS graph JSON"""
+
+        return ASGraph.from_json(json.loads(self.as_graph_data_json_path.read_text()))
+
+    @cached_property
+    def as_graph_pickle_path(self) -> Path:
+        """Path to the pickled ASGraph
+
+        Keyed by the JSON's path, mtime, and size, so that if the JSON changes,
+        the pickle is automatically invalidated. Also keyed by the __slots__ of
+        ASes, policies, and announcements (and AS_GRAPH_PICKLE_VERSION), so that
+        a pickle written with a different layout is never loaded
+        """
+
+        json_path = self.as_graph_data_json_path.resolve()
+        stat = json_path.stat()
+        pickled_layout = (
+            AS_GRAPH_PICKLE_VERSION,
+            AS.__slots__,
+            Policy.__slots__,
+            Announcement.__slots__,
+        )
+        key = hashlib.md5(  # noqa: S324
+            f"{json_path}_{stat.st_mtime_ns}_{stat.st_size}_{pickled_layout}".encode()
+        ).hexdigest()
+        return SINGLE_DAY_CACHE_DIR / f"ASGraph_{key}.pickle"
+
     def _validate_init(self):
         """Validates inputs to __init__
 
@@ -269,9 +351,15 @@ class Simulation:
         We also don't multiprocess one by one because the start up cost of
         each process is huge (since each process must generate it's own engine
         ) so we must divy up the work beforehand
+
+        Never returns empty chunks, since a process with no trials would still
+        pay the cost of loading the graph (so with no trials, there are no chunks)
         """
 
         trials_list = list(range(self.num_trials))
+        if not trials_list:
+            return []
+        cpus = max(min(cpus, len(trials_list)), 1)
         return [trials_list[i::cpus] for i in range(cpus)]
 
     def _get_single_process_results(self) -> list[DataTracker]:
@@ -285,10 +373,13 @@ class Simulation:
         Previously used starmap, but now we have tqdm
         """
 
+        # Only spin up as many processes as there are chunks of trials
+        chunks = self._get_chunks(self.parse_cpus)
+        if not chunks:
+            return []
         # Pool is much faster than ProcessPoolExecutor
-        with Pool(self.parse_cpus) as p:
+        with Pool(len(chunks)) as p:
             # return p.starmap(self._run_chunk, enumerate(self._get_chunks(parse_cpus)))
-            chunks = self._get_chunks(self.parse_cpus)
             desc = f"Simulating {self.output_dir.name}"
             total = (
                 sum(len(x) for x in chunks)
@@ -339,12 +430,8 @@ class Simulation:
         # Must also seed randomness here since we don't want multiproc to be the same
         self._seed_random(seed_suffix=str(chunk_id))
 
-        # ASGraph is not picklable, so we need to create it here
-        engine = SimulationEngine(
-            as_graph=ASGraph.from_json(
-                json.loads(self.as_graph_data_json_path.read_text())
-            )
-        )
+        # Each process must have it's own engine, so load the prebuilt graph
+        engine = SimulationEngine(as_graph=self._load_as_graph())
 
         data_tracker = DataTracker(
             line_filters=self.line_filters,
@@ -415,6 +502,8 @@ class Simulation:
             * len(self.scenario_configs),
         )
 
+        # Free the graph now rather than waiting on the cyclic garbage collector
+        engine.as_graph.close()
         return data_tracker
 
     @cached_property
@@ -51,6 +51,13 @@ def pytest_sessionfinish(session, exitstatus):
             )
 
 
+@pytest.fixture(scope="session")
+def engine_gt_path() -> Path:
+    """Ground truth JSON of a small, already propagated engine"""
+
+    return DIAGRAM_PATH / "ex_000_valid_prefix_bgp_simple" / "engine_gt.json"
+
+
 @pytest.fixture(scope="session")
 def overwrite(pytestconfig):
     return pytestconfig.getoption("overwrite")
@@ -0,0 +1,85 @@
+"""Test that the AdjRIBsIn prefix index stays in sync"""
+
+import pickle
+
+from bgpsimulator.shared import Prefix, Relationships
+from bgpsimulator.simulation_engine import Announcement as Ann
+from bgpsimulator.simulation_engine.policy.adj_ribs_in import AdjRIBsIn, AnnInfo
+
+PREFIX = Prefix("1.2.0.0/16")
+NEIGHBOR_ASNS = (1, 2, 3)
+
+
+def _get_ann(neighbor_asn: int) -> Ann:
+    """Returns an ann for PREFIX that was sent by the neighbor"""
+
+    return Ann(
+        prefix=PREFIX,
+        as_path=(neighbor_asn, 777),
+        next_hop_asn=neighbor_asn,
+        recv_relationship=Relationships.CUSTOMERS,
+    )
+
+
+def _get_neighbor_asns(adj_ribs_in: AdjRIBsIn) -> list[int]:
+    """Returns the neighbor ASNs of the AnnInfos for PREFIX"""
+
+    return [
+        ann_info.unprocessed_ann.as_path[0]
+        for ann_info in adj_ribs_in.get_ann_infos(PREFIX)
+    ]
+
+
+class TestAdjRIBsIn:
+    """Tests for the AdjRIBsIn prefix index"""
+
+    def _get_adj_ribs_in(self) -> AdjRIBsIn:
+        """Returns an AdjRIBsIn with an ann for PREFIX from every neighbor"""
+
+        adj_ribs_in = AdjRIBsIn()
+        for neighbor_asn in NEIGHBOR_ASNS:
+            adj_ribs_in.add_unprocessed_ann(
+                _get_ann(neighbor_asn), Relationships.CUSTOMERS
+            )
+        return adj_ribs_in
+
+    def test_remove_and_readd(self):
+        """Test that the index matches the RIBs after removing and re-adding"""
+
+        adj_ribs_in = self._get_adj_ribs_in()
+        adj_ribs_in.remove_entry(1, PREFIX)
+        assert _get_neighbor_asns(adj_ribs_in) == [2, 3]
+        assert adj_ribs_in.get_unprocessed_ann_recv_rel(1, PREFIX) is None
+        adj_ribs_in.add_unprocessed_ann(_get_ann(1), Relationships.CUSTOMERS)
+        # Re-added neighbors move to the end (see get_ann_infos)
+        assert _get_neighbor_asns(adj_ribs_in) == [2, 3, 1]
+        assert adj_ribs_in.get_unprocessed_ann_recv_rel(1, PREFIX) is not None
+        # Removing an entry that doesn't exist is ignored
+        adj_ribs_in.remove_entry(4, PREFIX)
+        assert sorted(_get_neighbor_asns(adj_ribs_in)) == list(NEIGHBOR_ASNS)
+
+    def test_dict_methods(self):
+        """Test that the dict methods also update the index"""
+
+        adj_ribs_in = self._get_adj_ribs_in()
+        del adj_ribs_in[1]
+        adj_ribs_in.pop(2)
+        assert adj_ribs_in.pop(2, None) is None
+        assert _get_neighbor_asns(adj_ribs_in) == [3]
+        adj_ribs_in[4] = {PREFIX: AnnInfo(_get_ann(4), Relationships.PEERS)}
+        adj_ribs_in.update({5: {PREFIX: AnnInfo(_get_ann(5), Relationships.PEERS)}})
+        adj_ribs_in.setdefault(6)
+        assert _get_neighbor_asns(adj_ribs_in) == [3, 4, 5]
+        adj_ribs_in.popitem()
+        adj_ribs_in.popitem()
+        assert _get_neighbor_asns(adj_ribs_in) == [3, 4]
+        adj_ribs_in.clear()
+        assert _get_neighbor_asns(adj_ribs_in) == []
+
+    def test_pickle(self):
+        """Test that the index is rebuilt when unpickled"""
+
+        adj_ribs_in = self._get_adj_ribs_in()
+        unpickled_adj_ribs_in = pickle.loads(pickle.dumps(adj_ribs_in))  # noqa: S301
+        assert unpickled_adj_ribs_in == adj_ribs_in
+        assert _get_neighbor_asns(unpickled_adj_ribs_in) == list(NEIGHBOR_ASNS)
@@ -0,0 +1,35 @@
+"""Test ASGraph pickling"""
+
+import json
+import pickle
+from copy import deepcopy
+from pathlib import Path
+
+from bgpsimulator.as_graphs.as_graph import ASGraph
+from bgpsimulator.simulation_engine import SimulationEngine
+from bgpsimulator.tests.engine_tests.engine_test_configs.examples.ex_config_000 import (
+    graph_data,
+)
+
+
+class TestASGraph:
+    """Tests for ASGraph pickling"""
+
+    def test_pickle_roundtrip(self):
+        """Test that an unpickled ASGraph equals the original"""
+
+        as_graph = ASGraph(deepcopy(graph_data))
+        unpickled_as_graph = pickle.loads(pickle.dumps(as_graph))  # noqa: S301
+        assert unpickled_as_graph == as_graph
+        # The ASes must point to the new graph, not the original
+        for as_obj in unpickled_as_graph:
+            assert as_obj.as_graph is unpickled_as_graph
+
+    def test_pickle_roundtrip_propagated(self, engine_gt_path: Path):
+        """Test that an ASGraph with populated RIBs survives pickling"""
+
+        engine = SimulationEngine.from_json(json.loads(engine_gt_path.read_text()))
+        as_graph = engine.as_graph
+        assert any(as_obj.policy.local_rib for as_obj in as_graph)
+        unpickled_as_graph = pickle.loads(pickle.dumps(as_graph))  # noqa: S301
+        assert unpickled_as_graph == as_graph
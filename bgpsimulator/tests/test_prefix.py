@@ -0,0 +1,160 @@
+"""Test Prefix parsing, str roundtrips, and IPv6Network compatibility"""
+
+import pickle
+from ipaddress import IPv6Address, IPv6Network, ip_network
+
+import pytest
+
+from bgpsimulator.shared import IPAddr, Prefix, ReservedPrefixError
+
+PREFIX_STRS = [
+    "1.2.0.0/16",
+    "1.2.3.0/24",
+    "1.2.3.4/32",
+    "1.2.3.4",
+    "8.0.0.0/8",
+    "2001:db8::/32",
+    "2001:db8:1::/48",
+    "2001:db8::1/128",
+]
+
+
+def _get_ipv6_network(prefix: str) -> IPv6Network:
+    """Returns the IPv6Network that Prefix used to subclass for this prefix"""
+
+    network = ip_network(prefix)
+    if network.version == 4:
+        return IPv6Network(f"::ffff:{network.network_address}/{96 + network.prefixlen}")
+    else:
+        return IPv6Network(prefix)
+
+
+class TestPrefix:
+    """Tests for Prefix"""
+
+    @pytest.mark.parametrize("prefix_str", PREFIX_STRS)
+    def test_str_roundtrip(self, prefix_str: str):
+        """Test that str and repr return the prefix exactly as it was written"""
+
+        prefix = Prefix(prefix_str)
+        assert str(prefix) == prefix_str
+        assert repr(prefix) == prefix_str
+        assert Prefix(str(prefix)) == prefix
+
+    @pytest.mark.parametrize("prefix_str", PREFIX_STRS)
+    def test_parse(self, prefix_str: str):
+        """Test that the parsed prefix matches the old IPv6Network one"""
+
+        prefix = Prefix(prefix_str)
+        ipv6_network = _get_ipv6_network(prefix_str)
+        assert prefix.ipv6_network == ipv6_network
+        assert prefix.network_address == ipv6_network.network_address
+        assert prefix.prefixlen == ipv6_network.prefixlen
+        assert prefix.num_addresses == ipv6_network.num_addresses
+        # Falls back to the IPv6Network
+        assert prefix.netmask == ipv6_network.netmask
+        assert prefix.with_prefixlen == ipv6_network.with_prefixlen
+
+    def test_str_depends_on_spelling_only(self):
+        """Test that str doesn't depend on which equal spelling was parsed first"""
+
+        assert str(Prefix("1.2.3.4")) == "1.2.3.4"
+        assert str(Prefix("1.2.3.4/32")) == "1.2.3.4/32"
+        assert str(Prefix("1.2.3.4")) == "1.2.3.4"
+
+    def test_eq_and_hash(self):
+        """Test that equality and hashing match the old semantics
+
+        Equal prefixes are equal no matter how they're spelled, and hash to
+        the network address * 1000 + the prefixlen as it was written
+        """
+
+        assert Prefix("1.2.3.4") == Prefix("1.2.3.4/32")
+        assert hash(Prefix("1.2.3.4")) == hash(Prefix("1.2.3.4/32"))
+        assert Prefix("1.2.0.0/16") != Prefix("1.2.0.0/17")
+        assert Prefix("1.2.0.0/16") != Prefix("2001:db8::/32")
+        for prefix_str in PREFIX_STRS:
+            ipv6_network = _get_ipv6_network(prefix_str)
+            og_prefixlen = ip_network(prefix_str).prefixlen
+            assert hash(Prefix(prefix_str)) == hash(
+                int(ipv6_network.network_address) * 1000 + og_prefixlen
+            )
+        assert len({Prefix(x) for x in PREFIX_STRS}) == len(PREFIX_STRS) - 1
+
+    def test_ordering(self):
+        """Test that sorting matches sorting the equivalent IPv6Networks"""
+
+        prefixes = [Prefix(x) for x in PREFIX_STRS]
+        assert [x.ipv6_network for x in sorted(prefixes)] == sorted(
+            _get_ipv6_network(x) for x in PREFIX_STRS
+        )
+        assert Prefix("1.2.0.0/16") <= Prefix("1.2.3.0/24")
+        assert Prefix("2001:db8::/32") > Prefix("1.2.0.0/16")
+
+    @pytest.mark.parametrize("prefix_str_1", PREFIX_STRS)
+    @pytest.mark.parametrize("prefix_str_2", PREFIX_STRS)
+    def test_subnet_of_and_overlaps(self, prefix_str_1: str, prefix_str_2: str):
+        """Test that subnet checks match the equivalent IPv6Networks"""
+
+        prefix_1, prefix_2 = Prefix(prefix_str_1), Prefix(prefix_str_2)
+        network_1 = _get_ipv6_network(prefix_str_1)
+        network_2 = _get_ipv6_network(prefix_str_2)
+        assert prefix_1.subnet_of(prefix_2) == network_1.subnet_of(network_2)
+        assert prefix_1.supernet_of(prefix_2) == network_1.supernet_of(network_2)
+        assert prefix_1.overlaps(prefix_2) == network_1.overlaps(network_2)
+
+    @pytest.mark.parametrize("prefix_str", PREFIX_STRS)
+    @pytest.mark.parametrize(
+        "ip_addr_str", ["1.2.3.4", "1.2.4.4", "8.8.8.8", "2001:db8::1", "2001:db9::1"]
+    )
+    def test_contains(self, prefix_str: str, ip_addr_str: str):
+        """Test that containment matches the equivalent IPv6Network"""
+
+        prefix = Prefix(prefix_str)
+        ip_addr = IPAddr(ip_addr_str)
+        ipv6_address = _get_ipv6_network(ip_addr_str).network_address
+        expected = ipv6_address in _get_ipv6_network(prefix_str)
+        assert (ip_addr in prefix) == expected
+        assert (ipv6_address in prefix) == expected
+
+    def test_contains_prefix(self):
+        """Test that a prefix contains its subprefixes, and not its supernets"""
+
+        assert Prefix("1.2.3.0/24") in Prefix("1.2.0.0/16")
+        assert Prefix("1.2.0.0/16") in Prefix("1.2.0.0/16")
+        assert Prefix("1.2.0.0/16") not in Prefix("1.2.3.0/24")
+        assert Prefix("2001:db8::/32") not in Prefix("1.2.0.0/16")
+
+    def test_iter_and_getitem(self):
+        """Test that iterating and indexing match the equivalent IPv6Network"""
+
+        prefix = Prefix("1.2.3.0/30")
+        ipv6_network = _get_ipv6_network("1.2.3.0/30")
+        assert list(prefix) == list(ipv6_network)
+        assert prefix[0] == ipv6_network[0] == IPv6Address("::ffff:1.2.3.0")
+        assert prefix[-1] == ipv6_network[-1]
+
+    @pytest.mark.parametrize("prefix_str", PREFIX_STRS)
+    def test_pickle(self, prefix_str: str):
+        """Test that unpickled prefixes are interned, with the same str"""
+
+        prefix = Prefix(prefix_str)
+        unpickled_prefix = pickle.loads(pickle.dumps(prefix))  # noqa: S301
+        assert unpickled_prefix is prefix
+        assert str(unpickled_prefix) == prefix_str
+
+    @pytest.mark.parametrize(
+        ("prefix_str", "match"),
+        [("1.2.3.4/16", "host bits set"), ("1.2.3", "does not appear to be")],
+    )
+    def test_invalid(self, prefix_str: str, match: str):
+        """Test that invalid prefixes raise errors"""
+
+        with pytest.raises(ValueError, match=match):
+            Prefix(prefix_str)
+
+    def test_reserved(self):
+        """Test that reserved prefixes raise errors"""
+
+        with pytest.raises(ReservedPrefixError):
+            Prefix("240.0.0.0/4")
@@ -0,0 +1,32 @@
+"""Test SimulationEngine equality"""
+
+import json
+from pathlib import Path
+
+from bgpsimulator.simulation_engine import SimulationEngine
+
+
+class TestSimulationEngine:
+    """Tests for SimulationEngine equality"""
+
+    def test_eq(self, engine_gt_path: Path):
+        """Test that engines loaded from the same JSON are equal"""
+
+        engine_1 = SimulationEngine.from_json(json.loads(engine_gt_path.read_text()))
+        engine_2 = SimulationEngine.from_json(json.loads(engine_gt_path.read_text()))
+        assert engine_1 == engine_2
+
+    def test_eq_local_rib_mutated(self, engine_gt_path: Path):
+        """Test that engines with different local RIBs are not equal
+
+        Engine tests rely on this to catch a wrong ground truth
+        """
+
+        engine_json = json.loads(engine_gt_path.read_text())
+        mutated_engine_json = json.loads(engine_gt_path.read_text())
+        ases = mutated_engine_json["as_graph"]["ases"]
+        as_info = next(x for x in ases.values() if x["policy"]["local_rib"])
+        as_info["policy"]["local_rib"] = {}
+        assert SimulationEngine.from_json(engine_json) != SimulationEngine.from_json(
+            mutated_engine_json
+        )